@@ -19,10 +19,16 @@ Status flow (Phase 3):
   'submitted'  →  'human_reviewed'
 """
 
-from datetime import datetime, timezone
+import base64
+import json
+from datetime import datetime
 from uuid import UUID
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
+from postgrest.exceptions import APIError
+from pydantic import BaseModel
 
 from app.core.auth import AdminUser, require_admin
 from app.core.logging import get_logger
@@ -32,56 +38,119 @@ from app.schemas.admin import (
     SubmissionDetail,
     SubmissionListResponse,
 )
+from app.services.supabase import execute_async
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# SQLSTATE codes raised by public.review_submission() — see
+# supabase/migrations/20260301000000_create_review_submission_function.sql
+_REVIEW_ERROR_STATUS = {
+    "P0002": status.HTTP_404_NOT_FOUND,
+    "CS409": status.HTTP_409_CONFLICT,
+    "CS422": status.HTTP_422_UNPROCESSABLE_CONTENT,
+}
+
+# Columns needed by SubmissionSummary — the list view never loads
+# ``content`` or ``llm_feedback``. Related data the admin UI shows per row is
+# embedded here (PostgREST resource embedding over the user_id → profiles FK)
+# so the page stays a single query. Add new per-row fields to this embed,
+# never as follow-up queries per submission.
+_SUMMARY_COLUMNS = (
+    "id,user_id,lesson_id,status,submitted_at,llm_score,reviewer_score,final_score,"
+    "user:profiles!user_id(display_name,avatar_url)"
+)
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a response model in one pass with pydantic-core.
+
+    Returning the model itself would re-validate it against ``response_model``
+    and run ``jsonable_encoder`` + stdlib ``json`` — noticeable on 100-row pages.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _encode_cursor(row: dict) -> str:
+    """Serialize the keyset position ``(submitted_at, id)`` of a row as an opaque cursor."""
+    raw = json.dumps([row["submitted_at"], row["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """Inverse of ``_encode_cursor``. Raises HTTPException 400 on a malformed cursor."""
+    try:
+        submitted_at, submission_id = json.loads(base64.urlsafe_b64decode(cursor))
+        # Validate both halves before they are interpolated into a filter.
+        return datetime.fromisoformat(submitted_at).isoformat(), str(UUID(submission_id))
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from exc
+
 
 @router.get(
     "/admin/submissions",
     response_model=SubmissionListResponse,
     summary="List exercise submissions (admin)",
     description=(
-        "Returns a paginated list of exercise submissions. "
-        "Optionally filter by status (submitted, ai_graded, human_reviewed)."
+        "Returns a cursor-paginated list of exercise submissions, newest first. "
+        "Optionally filter by status (submitted, ai_graded, human_reviewed). "
+        "Pass the returned ``next_cursor`` to fetch the following page."
     ),
 )
 async def list_submissions(
     request: Request,
     admin: AdminUser = Depends(require_admin),
     submission_status: str | None = None,
-    page: int = 1,
+    cursor: str | None = None,
     page_size: int = 20,
-) -> SubmissionListResponse:
+) -> Response:
     """List submissions for admin review.
 
+    Uses keyset pagination on ``(submitted_at, id)`` so every page costs the
+    same regardless of depth — no OFFSET scan and no exact COUNT.
+
+    PostgREST rows are already JSON-shaped and ``_SUMMARY_COLUMNS`` fixes their
+    keys to ``SubmissionSummary``'s, so the page is encoded straight to bytes
+    with orjson — no per-row model construction on this path.
+
     Args:
         submission_status: Filter by status (e.g. 'submitted' for pending review).
-        page: Page number (1-indexed).
+        cursor: Opaque cursor from a previous response's ``next_cursor``.
         page_size: Number of items per page (max 100).
     """
     supabase = request.app.state.supabase
-    page_size = min(page_size, 100)  # Cap to prevent abuse
-    offset = (max(page, 1) - 1) * page_size
+    page_size = max(min(page_size, 100), 1)  # Cap to prevent abuse
 
     try:
         # Build query — select submissions ordered by newest first
-        query = supabase.table("exercise_submissions").select(
-            "*", count="exact"
-        )
+        query = supabase.table("exercise_submissions").select(_SUMMARY_COLUMNS)
 
         if submission_status:
             query = query.eq("status", submission_status)
 
-        result = (
+        if cursor:
+            cursor_ts, cursor_id = _decode_cursor(cursor)
+            query = query.or_(
+                f'submitted_at.lt."{cursor_ts}",'
+                f'and(submitted_at.eq."{cursor_ts}",id.lt.{cursor_id})'
+            )
+
+        # Fetch one extra row to learn whether another page exists.
+        result = await execute_async(
             query.order("submitted_at", desc=True)
-            .range(offset, offset + page_size - 1)
-            .execute()
+            .order("id", desc=True)
+            .limit(page_size + 1)
         )
 
-        submissions = [SubmissionDetail(**row) for row in (result.data or [])]
-        total = result.count if result.count is not None else len(submissions)
+        rows = result.data or []
+        has_more = len(rows) > page_size
+        submissions = rows[:page_size]
 
+    except HTTPException:
+        raise
     except Exception as exc:
         logger.error("admin_list_submissions_failed", error=str(exc))
         raise HTTPException(
@@ -89,20 +158,26 @@ async def list_submissions(
             detail="Failed to fetch submissions",
         ) from exc
 
+    next_cursor = _encode_cursor(submissions[-1]) if has_more else None
+
     logger.info(
         "admin_list_submissions",
         admin_id=str(admin.user_id),
         status_filter=submission_status,
-        page=page,
         count=len(submissions),
-        total=total,
+        has_more=has_more,
     )
 
-    return SubmissionListResponse(
-        submissions=submissions,
-        total=total,
-        page=page,
-        page_size=page_size,
+    return Response(
+        content=orjson.dumps(
+            {
+                "submissions": submissions,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "page_size": page_size,
+            }
+        ),
+        media_type="application/json",
     )
 
 
@@ -115,17 +190,16 @@ async def get_submission(
     submission_id: UUID,
     request: Request,
     admin: AdminUser = Depends(require_admin),
-) -> SubmissionDetail:
+) -> Response:
     """Fetch a single submission by ID for admin review."""
     supabase = request.app.state.supabase
 
     try:
-        result = (
+        result = await execute_async(
             supabase.table("exercise_submissions")
             .select("*")
             .eq("id", str(submission_id))
             .single()
-            .execute()
         )
     except Exception as exc:
         logger.error(
@@ -150,7 +224,7 @@ async def get_submission(
         submission_id=str(submission_id),
     )
 
-    return SubmissionDetail(**result.data)
+    return _json_response(SubmissionDetail(**result.data))
 
 
 @router.post(
@@ -174,64 +248,34 @@ async def review_submission(
     """
     supabase = request.app.state.supabase
 
-    # ── Verify the submission exists and is in a reviewable state ──────────────
-    try:
-        fetch_result = (
-            supabase.table("exercise_submissions")
-            .select("id, status")
-            .eq("id", str(submission_id))
-            .single()
-            .execute()
-        )
-    except Exception as exc:
-        logger.error(
-            "review_fetch_failed",
-            submission_id=str(submission_id),
-            error=str(exc),
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Submission {submission_id} not found",
-        ) from exc
-
-    if not fetch_result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Submission {submission_id} not found",
-        )
-
-    current_status = fetch_result.data.get("status")
-
-    # Status guard: only 'submitted' or 'ai_graded' can transition to 'human_reviewed'
-    # See docs/AGENTS.md Section 4.5 — no agent may skip or reverse transitions.
-    if current_status == "human_reviewed":
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Submission has already been reviewed",
-        )
-
-    if current_status not in ("submitted", "ai_graded"):
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"Cannot review submission with status '{current_status}'",
-        )
-
-    # ── Write the review ──────────────────────────────────────────────────────
-    now = datetime.now(timezone.utc).isoformat()
-
+    # ── Conditional UPDATE … RETURNING in a single round-trip ────────────────
+    # public.review_submission() applies the status guard and the write in one
+    # statement: only 'submitted' or 'ai_graded' can transition to
+    # 'human_reviewed'. See docs/AGENTS.md Section 4.5 — no agent may skip or
+    # reverse transitions.
     try:
-        update_result = (
-            supabase.table("exercise_submissions")
-            .update(
+        update_result = await execute_async(
+            supabase.rpc(
+                "review_submission",
                 {
-                    "reviewer_score": body.reviewer_score,
-                    "status": "human_reviewed",
-                    "reviewed_at": now,
-                }
+                    "p_submission_id": str(submission_id),
+                    "p_reviewer_score": body.reviewer_score,
+                },
             )
-            .eq("id", str(submission_id))
-            .execute()
         )
+    except APIError as exc:
+        http_status = _REVIEW_ERROR_STATUS.get(exc.code or "")
+        if http_status is None:
+            logger.error(
+                "review_update_failed",
+                submission_id=str(submission_id),
+                error=str(exc),
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to save review",
+            ) from exc
+        raise HTTPException(status_code=http_status, detail=exc.message) from exc
     except Exception as exc:
         logger.error(
             "review_update_failed",
@@ -243,7 +287,9 @@ async def review_submission(
             detail="Failed to save review",
         ) from exc
 
-    updated = update_result.data[0] if update_result.data else {}
+    updated = update_result.data or {}
+    if isinstance(updated, list):
+        updated = updated[0] if updated else {}
 
     logger.info(
         "submission_reviewed",
@@ -251,7 +297,6 @@ async def review_submission(
         admin_email=admin.email,
         submission_id=str(submission_id),
         reviewer_score=body.reviewer_score,
-        previous_status=current_status,
     )
 
     return ReviewResponse(
@@ -4,20 +4,26 @@ app/api/v1/grade.py
 POST /api/v1/grade — Supabase webhook receiver for new exercise submissions.
 
 Flow (Phase 2):
-  1. Validate payload shape via SupabaseWebhookPayload (Pydantic).
-  2. Optionally verify HMAC signature if WEBHOOK_SECRET is configured.
-  3. Enqueue the submission ID to Redis "grading_queue" for Phase 3 worker.
+  1. Optionally verify HMAC signature if WEBHOOK_SECRET is configured.
+  2. Validate payload shape via SupabaseWebhookPayload (Pydantic), parsing the
+     raw body bytes directly with ``model_validate_json``.
+  3. Append the submission ID to the Redis stream "grading_stream" (XADD).
   4. Return HTTP 202 Accepted immediately — grading is async.
 
 Flow (Phase 3+):
-  - The worker process (app/workers/grading_worker.py) picks up the ID
-    from the queue, fetches the full submission, compiles the prompt,
-    calls Langchain, and writes back llm_score + llm_feedback.
+  - The worker process (app/workers/grading_worker.py) reads IDs in batches
+    via a consumer group, fetches the full submission, compiles the prompt,
+    calls Langchain, writes back llm_score + llm_feedback, and XACKs.
 
 Security note:
   - WEBHOOK_SECRET validation is implemented but SKIPPED if the env var
     is not set (graceful degradation for local dev). It will be enforced
     in production by configuring Supabase to send the secret.
+  - Two header schemes are accepted:
+      ``X-Webhook-Signature: sha256=<hex>`` — HMAC-SHA256 of the raw body
+      keyed with WEBHOOK_SECRET (preferred; the secret never travels).
+      ``X-Webhook-Secret: <secret>`` — the shared secret itself, as sent by
+      a plain Supabase Database Webhook custom header.
 
 Contract defined in docs/AGENTS.md Section 4.2.
 """
@@ -28,47 +34,60 @@ from uuid import UUID
 
 import redis.asyncio as aioredis
 from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
-from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.schemas.grading import SupabaseWebhookPayload
 
 logger = get_logger(__name__)
 router = APIRouter()
 
-# Redis key for the grading task queue (FIFO via LPUSH / BRPOP).
-GRADING_QUEUE_KEY = "cs4all:grading_queue"
+# Redis stream for grading tasks (XADD here, XREADGROUP + XACK in the worker).
+GRADING_STREAM_KEY = "cs4all:grading_stream"
+# Approximate cap on retained stream entries. MAXLEN ~ trims the oldest
+# entries whether or not they were acked, so it must stay far above the
+# worst-case pending backlog.
+GRADING_STREAM_MAXLEN = 100_000
 
 
 def _verify_webhook_signature(
     raw_body: bytes,
     x_webhook_secret: str | None,
-    expected_secret: str,
+    x_webhook_signature: str | None,
+    secret_bytes: bytes,
 ) -> None:
-    """Verify the webhook's HMAC-SHA256 signature.
+    """Verify the webhook's HMAC-SHA256 signature (or shared secret).
 
-    Supabase custom webhooks can send a shared secret in a header.
-    We use constant-time comparison to prevent timing attacks.
+    If ``X-Webhook-Signature`` is present it must be ``sha256=<hex>`` of the
+    raw body. Otherwise Supabase custom webhooks can send the shared secret in
+    ``X-Webhook-Secret``. Both use constant-time comparison to prevent timing
+    attacks.
 
     Args:
         raw_body: The raw request body bytes.
         x_webhook_secret: The value of the ``X-Webhook-Secret`` header.
-        expected_secret: The secret from ``settings.webhook_secret``.
+        x_webhook_signature: The value of the ``X-Webhook-Signature`` header.
+        secret_bytes: ``settings.webhook_secret_bytes`` (pre-encoded).
 
     Raises:
         HTTPException 401: If the signature is missing or invalid.
     """
-    if not x_webhook_secret:
+    if x_webhook_signature:
+        expected = hmac.digest(secret_bytes, raw_body, hashlib.sha256)
+        try:
+            provided = bytes.fromhex(x_webhook_signature.removeprefix("sha256="))
+        except ValueError:
+            provided = b""
+        is_valid = hmac.compare_digest(provided, expected)
+    elif x_webhook_secret:
+        is_valid = hmac.compare_digest(x_webhook_secret.encode(), secret_bytes)
+    else:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing X-Webhook-Secret header",
+            detail="Missing X-Webhook-Signature or X-Webhook-Secret header",
         )
 
-    # Constant-time comparison to prevent timing attacks.
-    is_valid = hmac.compare_digest(
-        x_webhook_secret.encode(),
-        expected_secret.encode(),
-    )
     if not is_valid:
         logger.warning("webhook_signature_invalid")
         raise HTTPException(
@@ -89,22 +108,24 @@ def _verify_webhook_signature(
 )
 async def receive_grading_webhook(
     request: Request,
-    payload: SupabaseWebhookPayload,
     x_webhook_secret: str | None = Header(default=None),
+    x_webhook_signature: str | None = Header(default=None),
 ) -> dict:
     """Validate webhook payload and enqueue submission for grading.
 
     The endpoint intentionally does NOT perform grading inline — it returns
     immediately to avoid Supabase webhook timeouts (30 s limit).
     """
-    settings = get_settings()
+    settings = request.app.state.settings
+    raw_body = await request.body()
 
     # ── 1. Webhook signature check (if secret is configured) ─────────────────
-    if settings.webhook_secret:
+    if settings.webhook_secret_bytes:
         _verify_webhook_signature(
-            raw_body=await request.body(),
+            raw_body=raw_body,
             x_webhook_secret=x_webhook_secret,
-            expected_secret=settings.webhook_secret,
+            x_webhook_signature=x_webhook_signature,
+            secret_bytes=settings.webhook_secret_bytes,
         )
     else:
         logger.debug(
@@ -112,6 +133,14 @@ async def receive_grading_webhook(
             reason="WEBHOOK_SECRET not configured — set it before going to production",
         )
 
+    # Parse the body bytes in one pass (no intermediate dict). Validation
+    # errors are re-raised so FastAPI still answers with its usual 422.
+    try:
+        payload = SupabaseWebhookPayload.model_validate_json(raw_body)
+    except ValidationError as exc:
+        errors = [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)]
+        raise RequestValidationError(errors, body=raw_body) from exc
+
     submission_id: UUID = payload.record.id
     lesson_id: str = payload.record.lesson_id
     user_id: UUID = payload.record.user_id
@@ -126,13 +155,18 @@ async def receive_grading_webhook(
     # ── 2. Enqueue submission ID for the grading worker ───────────────────────
     redis: aioredis.Redis = request.app.state.redis
     try:
-        # LPUSH + BRPOP makes a reliable FIFO queue.
-        # The worker (Phase 3) will BRPOP from the right end.
-        await redis.lpush(GRADING_QUEUE_KEY, str(submission_id))
+        # Stream entries stay pending in the worker's consumer group until
+        # XACKed, so a crashed worker's in-flight submissions are reclaimed.
+        await redis.xadd(
+            GRADING_STREAM_KEY,
+            {"submission_id": str(submission_id), "lesson_id": lesson_id},
+            maxlen=GRADING_STREAM_MAXLEN,
+            approximate=True,
+        )
         logger.info(
             "submission_enqueued",
             submission_id=str(submission_id),
-            queue=GRADING_QUEUE_KEY,
+            stream=GRADING_STREAM_KEY,
         )
     except Exception as exc:
         logger.error(
@@ -14,13 +14,17 @@ The response includes ``[ref:"..."]`` markers that the frontend parses
 into styled citation blocks referencing lesson equations/paragraphs.
 """
 
+import asyncio
+import contextlib
 from datetime import date
 
+import httpx
 from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
 
+from app.core.auth import verify_user_token
 from app.core.logging import get_logger
-from app.schemas.hint import HintRequest
+from app.schemas.hint import AnchorItem, HintRequest
 from app.services.github import ExerciseFetchError, fetch_lesson_context
 from app.services.hint_prompt import compile_hint_prompt
 from app.services.llm import GradingError, stream_hint
@@ -32,11 +36,83 @@ router = APIRouter()
 # Daily rate limit per user
 DAILY_HINT_LIMIT = 20
 HINT_COUNTER_PREFIX = "cs4all:hints"
+HINT_COUNTER_TTL = 86400  # 24 hours
+
+# Check, INCR and first-use EXPIRE in one atomic round-trip — a crash can never
+# leave a counter without a TTL. Returns -1 (without writing) once the limit is
+# reached, so blocked requests never touch the counter.
+#   KEYS[1] = counter key, ARGV[1] = limit, ARGV[2] = TTL seconds
+_RATE_LIMIT_LUA = """
+local c = tonumber(redis.call('GET', KEYS[1]) or '0')
+if c >= tonumber(ARGV[1]) then
+    return -1
+end
+c = redis.call('INCR', KEYS[1])
+if c == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return c
+"""
+
+
+def register_rate_limit_script(redis):
+    """Register the rate-limit script on ``redis`` and return the callable.
+
+    Called once in ``app.main.lifespan`` (stored as
+    ``app.state.hint_rate_limit``), so requests skip rebuilding the
+    ``Script`` and re-hashing its source. The call uses EVALSHA and loads
+    the script on the server the first time it is missing.
+    """
+    return redis.register_script(_RATE_LIMIT_LUA)
+
+
+# Pre-encoded SSE frames — the streaming loop only concatenates bytes.
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+_SSE_ERROR_PREFIX = b"data: [ERROR] "
+_SSE_UNEXPECTED_ERROR = b"data: [ERROR] An unexpected error occurred.\n\n"
+
+# Frames buffered between the LLM producer task and the response. When the
+# client reads slower than the model writes, the producer blocks here
+# (backpressure) instead of growing memory.
+HINT_QUEUE_MAXSIZE = 64
+
+
+async def _produce_sse(
+    prompt: str,
+    anchor_map: list[AnchorItem] | None,
+    queue: asyncio.Queue[bytes | None],
+    http: httpx.AsyncClient | None = None,
+) -> None:
+    """Run the LLM stream and queue SSE frames, ending with ``None``.
+
+    Runs as its own task so receiving from the LLM overlaps with sending to
+    the client; errors become ``[ERROR]`` frames like any other output.
+    """
+    try:
+        async for token in stream_hint(prompt, anchor_map=anchor_map, http=http):
+            # SSE format: data: <content>\n\n
+            await queue.put(_SSE_PREFIX + token.encode() + _SSE_SUFFIX)
+        await queue.put(_SSE_DONE)
+    except GradingError as exc:
+        logger.error("hint_stream_error", error=str(exc))
+        await queue.put(_SSE_ERROR_PREFIX + str(exc).encode() + _SSE_SUFFIX)
+    except Exception as exc:
+        logger.error(
+            "hint_stream_unexpected_error",
+            error=str(exc),
+            error_type=type(exc).__name__,
+        )
+        await queue.put(_SSE_UNEXPECTED_ERROR)
+    await queue.put(None)
 
 
 async def _get_user_id_from_request(request: Request) -> str:
     """Extract and validate user ID from the Supabase JWT.
 
+    See ``app.core.auth.verify_user_token`` for the verification strategy.
+
     Args:
         request: The incoming FastAPI request.
 
@@ -56,27 +132,18 @@ async def _get_user_id_from_request(request: Request) -> str:
     token = auth_header.removeprefix("Bearer ").strip()
     supabase = request.app.state.supabase
 
-    try:
-        user_response = supabase.auth.get_user(token)
-        if not user_response or not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token.",
-            )
-        return str(user_response.user.id)
-    except Exception as exc:
-        logger.warning("hint_auth_failed", error=str(exc))
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication failed.",
-        ) from exc
+    # Verified locally when SUPABASE_JWT_SECRET is set — no Supabase round-trip.
+    user = await verify_user_token(supabase, token)
+    return user.user_id
 
 
 async def _check_rate_limit(request: Request, user_id: str) -> None:
     """Check and increment the daily hint rate limit.
 
     Uses a Redis counter with key ``cs4all:hints:{user_id}:{YYYY-MM-DD}``
-    that expires at end of day.
+    that expires 24h after first use. The limit check, increment and expiry
+    are applied by a single Lua script, so this is one Redis round-trip, and
+    requests over the limit are rejected without incrementing the counter.
 
     Args:
         request: The FastAPI request (for Redis access).
@@ -85,21 +152,16 @@ async def _check_rate_limit(request: Request, user_id: str) -> None:
     Raises:
         HTTPException: 429 if rate limit exceeded.
     """
-    redis = request.app.state.redis
+    rate_limit = request.app.state.hint_rate_limit
     today = date.today().isoformat()
     key = f"{HINT_COUNTER_PREFIX}:{user_id}:{today}"
 
-    count = await redis.incr(key)
+    count = int(await rate_limit(keys=[key], args=[DAILY_HINT_LIMIT, HINT_COUNTER_TTL]))
 
-    # Set expiry on first use (24h from midnight)
-    if count == 1:
-        await redis.expire(key, 86400)  # 24 hours
-
-    if count > DAILY_HINT_LIMIT:
+    if count < 0:
         logger.warning(
             "hint_rate_limited",
             user_id=user_id,
-            count=count,
             limit=DAILY_HINT_LIMIT,
         )
         raise HTTPException(
@@ -132,7 +194,11 @@ async def ask_hint(body: HintRequest, request: Request):
 
     # 3. Fetch lesson context
     try:
-        context = await fetch_lesson_context(body.lesson_id)
+        context = await fetch_lesson_context(
+            body.lesson_id,
+            redis=request.app.state.redis,
+            http=request.app.state.http,
+        )
     except ExerciseFetchError as exc:
         logger.error(
             "hint_context_fetch_failed",
@@ -155,22 +221,19 @@ async def ask_hint(body: HintRequest, request: Request):
 
     # 5. Stream response
     async def sse_generator():
-        """Yield SSE-formatted chunks from the LLM stream."""
+        """Yield the SSE frames queued by the producer task."""
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=HINT_QUEUE_MAXSIZE)
+        producer = asyncio.create_task(
+            _produce_sse(prompt, body.anchor_map, queue, http=request.app.state.http)
+        )
         try:
-            async for token in stream_hint(prompt, anchor_map=body.anchor_map):
-                # SSE format: data: <content>\n\n
-                yield f"data: {token}\n\n"
-            yield "data: [DONE]\n\n"
-        except GradingError as exc:
-            logger.error("hint_stream_error", error=str(exc))
-            yield f"data: [ERROR] {exc}\n\n"
-        except Exception as exc:
-            logger.error(
-                "hint_stream_unexpected_error",
-                error=str(exc),
-                error_type=type(exc).__name__,
-            )
-            yield "data: [ERROR] An unexpected error occurred.\n\n"
+            while (frame := await queue.get()) is not None:
+                yield frame
+        finally:
+            # Client disconnected (or stream done) — stop paying for LLM tokens.
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
 
     return StreamingResponse(
         sse_generator(),
@@ -15,20 +15,42 @@ Usage:
         ...
 
 Security notes:
-  - Uses Supabase's own ``auth.get_user(token)`` to validate the JWT.
-    This performs a real API call to Supabase Auth, which verifies the token's
-    signature, expiry, and revocation status.
+  - If ``SUPABASE_JWT_SECRET`` is set, the JWT is verified locally (HS256
+    signature, expiry, ``aud == "authenticated"``) with no network call.
+    Tokens signed with another key or algorithm (key rotation, asymmetric
+    keys) fall back to Supabase's ``auth.get_user(token)``, a real API call
+    that also checks revocation status.
   - The ``is_admin`` check is a second DB query against ``public.profiles``.
+    The set of admin user IDs is preloaded at startup (``app.state.admins``)
+    and reloaded every ``ADMIN_SET_REFRESH_INTERVAL`` seconds and whenever a
+    message arrives on ``ADMIN_CHANGES_CHANNEL``, so known admins skip that
+    query entirely. Misses still fall back to the DB.
+  - Both results are cached in Redis for a short TTL (≤ 120 s, never past the
+    token's own ``exp``) so repeat admin requests skip both round-trips.
+    Cache keys use the SHA-256 of the token — the raw JWT is never stored.
+    The token entry only caches identity; the admin role is always re-checked
+    against ``app.state.admins`` / the per-user admin bit. Both expire within
+    ``AUTH_CACHE_MAX_TTL`` of a change to ``profiles.is_admin`` — including a
+    manual SQL update nobody announces — and an ``ADMIN_CHANGES_CHANNEL``
+    message drops them immediately.
   - Never log the raw JWT token.
 """
 
+import asyncio
+import base64
+import hashlib
+import json
+import time
 from dataclasses import dataclass
 from uuid import UUID
 
+import jwt
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.services.supabase import execute_async
 
 logger = get_logger(__name__)
 
@@ -38,6 +60,25 @@ _bearer_scheme = HTTPBearer(
     auto_error=True,  # Returns 403 if header is missing
 )
 
+# Redis keys for the auth cache. The JWT key maps sha256(token) → identity;
+# the admin key holds the ``is_admin`` bit so other endpoints can reuse it.
+AUTH_JWT_CACHE_PREFIX = "cs4all:auth:jwt"
+AUTH_ADMIN_CACHE_PREFIX = "cs4all:auth:admin"
+
+# Upper bound on how long a cached identity / admin bit is trusted (seconds).
+# Keeps revocations (logout, role change) effective within this window.
+AUTH_CACHE_MAX_TTL = 120
+
+# Pub/sub channel announcing ``profiles.is_admin`` changes. Any message makes
+# every API process reload its in-memory admin set.
+ADMIN_CHANGES_CHANNEL = "cs4all:admin_changes"
+# Seconds to wait before resubscribing after the pub/sub connection drops.
+ADMIN_WATCH_RETRY_DELAY = 5
+# Seconds between unconditional reloads of the in-memory admin set. Nothing
+# has to publish on ``ADMIN_CHANGES_CHANNEL`` (``is_admin`` is usually flipped
+# by hand in SQL), so this bounds how long a demoted admin keeps access.
+ADMIN_SET_REFRESH_INTERVAL = AUTH_CACHE_MAX_TTL
+
 
 @dataclass(frozen=True)
 class AdminUser:
@@ -47,6 +88,246 @@ class AdminUser:
     email: str
 
 
+@dataclass(frozen=True)
+class VerifiedUser:
+    """Identity extracted from a verified Supabase JWT."""
+
+    user_id: str
+    email: str | None
+
+
+def _decode_jwt_locally(token: str) -> VerifiedUser | None:
+    """Verify a Supabase JWT with ``SUPABASE_JWT_SECRET``.
+
+    Returns None when local verification is not possible — no secret
+    configured, or a signature/algorithm mismatch that may come from key
+    rotation — so the caller can fall back to Supabase Auth.
+
+    Raises:
+        jwt.InvalidTokenError: The token is definitively invalid (expired,
+            wrong audience, malformed, missing ``sub``).
+    """
+    secret = get_settings().supabase_jwt_secret
+    if not secret:
+        return None
+
+    try:
+        claims = jwt.decode(
+            token,
+            secret,
+            algorithms=["HS256"],
+            audience="authenticated",
+            options={"require": ["exp", "sub"]},
+        )
+    except (jwt.InvalidSignatureError, jwt.InvalidAlgorithmError):
+        return None
+
+    return VerifiedUser(user_id=claims["sub"], email=claims.get("email"))
+
+
+async def verify_user_token(supabase, token: str) -> VerifiedUser:
+    """Verify a Supabase JWT — locally when possible, else via Supabase Auth.
+
+    Raises:
+        HTTPException 401: Invalid or expired token.
+    """
+    try:
+        verified = _decode_jwt_locally(token)
+    except jwt.InvalidTokenError as exc:
+        logger.warning("auth_token_validation_failed", error=str(exc))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired authentication token",
+        ) from exc
+
+    if verified is not None:
+        return verified
+
+    try:
+        user = (await asyncio.to_thread(supabase.auth.get_user, token)).user
+    except Exception as exc:
+        logger.warning("auth_token_validation_failed", error=str(exc))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication failed — could not verify token",
+        ) from exc
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired authentication token",
+        )
+
+    return VerifiedUser(user_id=str(user.id), email=user.email)
+
+
+def _token_cache_key(token: str) -> str:
+    """Return the Redis key for a token. Only the SHA-256 digest is used."""
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    return f"{AUTH_JWT_CACHE_PREFIX}:{digest}"
+
+
+def _token_exp(token: str) -> int | None:
+    """Read the ``exp`` claim from a JWT payload without verifying it.
+
+    Only called after Supabase Auth has already verified the token, so the
+    claim is trusted. Returns None if the payload cannot be decoded.
+    """
+    try:
+        payload_b64 = token.split(".")[1]
+        payload_b64 += "=" * (-len(payload_b64) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload_b64)).get("exp")
+        return int(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError):
+        return None
+
+
+def _cache_ttl(token: str) -> int:
+    """TTL for a cached entry: min(token lifetime left, AUTH_CACHE_MAX_TTL)."""
+    exp = _token_exp(token)
+    if exp is None:
+        return AUTH_CACHE_MAX_TTL
+    return min(exp - int(time.time()), AUTH_CACHE_MAX_TTL)
+
+
+async def get_cached_is_admin(redis, user_id: str) -> bool | None:
+    """Return the cached ``is_admin`` bit for a user, or None on miss/error."""
+    try:
+        cached = await redis.get(f"{AUTH_ADMIN_CACHE_PREFIX}:{user_id}")
+    except Exception as exc:
+        logger.warning("auth_cache_read_failed", error=str(exc))
+        return None
+    if cached is None:
+        return None
+    return cached == "1"
+
+
+async def _cache_auth_result(
+    redis,
+    cache_key: str | None,
+    user_id: str,
+    email: str,
+    is_admin: bool,
+    ttl: int,
+    *,
+    store_admin_bit: bool,
+) -> None:
+    """Store the token identity (and, if freshly queried, the ``is_admin`` bit).
+
+    ``cache_key`` is None when the identity itself came from the cache. The
+    admin bit is only written when it came from the database, so a cached
+    bit is never kept alive past its original TTL. Failures are logged only.
+    """
+    if ttl <= 0 or (cache_key is None and not store_admin_bit):
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            if cache_key is not None:
+                pipe.setex(cache_key, ttl, json.dumps({"user_id": user_id, "email": email}))
+            if store_admin_bit:
+                pipe.setex(
+                    f"{AUTH_ADMIN_CACHE_PREFIX}:{user_id}",
+                    AUTH_CACHE_MAX_TTL,
+                    "1" if is_admin else "0",
+                )
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("auth_cache_write_failed", error=str(exc))
+
+
+async def invalidate_auth_cache(
+    redis,
+    *,
+    token: str | None = None,
+    user_id: str | None = None,
+    announce: bool = True,
+) -> None:
+    """Drop cached auth state on logout (``token``) or role change (``user_id``).
+
+    A role change should always pass ``user_id``: the admin bit is deleted and
+    every process is told (on ``ADMIN_CHANGES_CHANNEL``) to reload its
+    in-memory admin set. ``watch_admin_changes`` calls this with
+    ``announce=False`` for each message it receives, so changes announced by
+    anything else (e.g. a SQL ``pg_notify`` bridge) drop the bit too.
+    """
+    keys = []
+    if token:
+        keys.append(_token_cache_key(token))
+    if user_id:
+        keys.append(f"{AUTH_ADMIN_CACHE_PREFIX}:{user_id}")
+    if not keys:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            if user_id and announce:
+                pipe.publish(ADMIN_CHANGES_CHANNEL, user_id)
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("auth_cache_invalidate_failed", error=str(exc))
+
+
+async def load_admin_ids(supabase) -> frozenset[str]:
+    """Return the user IDs of all admins (``profiles.is_admin = true``).
+
+    Returns an empty set on failure — ``require_admin`` then falls back to
+    the per-request ``profiles`` query, so this is never fatal.
+    """
+    try:
+        result = await execute_async(
+            supabase.table("profiles").select("id").eq("is_admin", True)
+        )
+    except Exception as exc:
+        logger.warning("admin_set_load_failed", error=str(exc))
+        return frozenset()
+    admins = frozenset(str(row["id"]) for row in result.data or [])
+    logger.info("admin_set_loaded", count=len(admins))
+    return admins
+
+
+async def watch_admin_changes(state) -> None:
+    """Reload ``state.admins`` periodically and on ``ADMIN_CHANGES_CHANNEL``.
+
+    The set is reloaded at least every ``ADMIN_SET_REFRESH_INTERVAL`` seconds,
+    so unannounced changes still take effect. A message payload is the
+    changed user's ID; that user's cached admin bit is dropped before the
+    reload. Runs as a background task for the lifetime of the app (see
+    ``app.main.lifespan``), which preloads ``state.admins`` first. The set
+    is also reloaded after every resubscribe, so changes published while
+    disconnected are not missed.
+    """
+    loop = asyncio.get_running_loop()
+    resubscribe = False
+    while True:
+        pubsub = state.redis.pubsub()
+        try:
+            await pubsub.subscribe(ADMIN_CHANGES_CHANNEL)
+            if resubscribe:
+                state.admins = await load_admin_ids(state.supabase)
+            next_reload = loop.time() + ADMIN_SET_REFRESH_INTERVAL
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=max(next_reload - loop.time(), 0.0),
+                )
+                if message is not None and message["type"] == "message":
+                    await invalidate_auth_cache(
+                        state.redis, user_id=message["data"], announce=False
+                    )
+                elif loop.time() < next_reload:
+                    continue
+                state.admins = await load_admin_ids(state.supabase)
+                next_reload = loop.time() + ADMIN_SET_REFRESH_INTERVAL
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("admin_watch_failed", error=str(exc))
+            await asyncio.sleep(ADMIN_WATCH_RETRY_DELAY)
+        finally:
+            resubscribe = True
+            await pubsub.aclose()
+
+
 async def require_admin(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(_bearer_scheme),
@@ -62,62 +343,78 @@ async def require_admin(
     """
     token = credentials.credentials
     supabase = request.app.state.supabase
+    redis = request.app.state.redis
+    cache_key = _token_cache_key(token)
 
-    # ── Step 1: Verify the JWT with Supabase Auth ─────────────────────────────
+    # ── Step 0: Reuse the cached token identity if possible ──────────────────
+    # A Redis failure is never fatal here — we fall through to Supabase.
     try:
-        user_response = supabase.auth.get_user(token)
-        user = user_response.user
-
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired authentication token",
-            )
-    except HTTPException:
-        raise
+        cached = await redis.get(cache_key)
     except Exception as exc:
-        logger.warning("auth_token_validation_failed", error=str(exc))
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication failed — could not verify token",
-        ) from exc
-
-    user_id = user.id
-    email = user.email or "unknown"
+        logger.warning("auth_cache_read_failed", error=str(exc))
+        cached = None
 
-    # ── Step 2: Check admin role in profiles table ────────────────────────────
-    try:
-        result = (
-            supabase.table("profiles")
-            .select("is_admin")
-            .eq("id", str(user_id))
-            .single()
-            .execute()
-        )
-        profile = result.data
+    if cached is not None:
+        # Identity only — the admin role is re-checked below so a revocation
+        # takes effect without waiting for this entry to expire.
+        entry = json.loads(cached)
+        user_id = entry["user_id"]
+        email = entry["email"]
+        logger.debug("admin_auth_cache_hit", user_id=user_id)
+    else:
+        # ── Step 1: Verify the JWT (locally, or with Supabase Auth) ──────────
+        user = await verify_user_token(supabase, token)
+        user_id = user.user_id
+        email = user.email or "unknown"
 
-        if not profile or not profile.get("is_admin"):
-            logger.warning(
-                "admin_access_denied",
+    # ── Step 2: Check admin role (in-memory set, cached bit, else profiles) ───
+    if user_id in request.app.state.admins:
+        is_admin = True
+        admin_bit_cached = True
+    else:
+        is_admin = await get_cached_is_admin(redis, str(user_id))
+        admin_bit_cached = is_admin is not None
+    if not admin_bit_cached:
+        try:
+            result = await execute_async(
+                supabase.table("profiles")
+                .select("is_admin")
+                .eq("id", str(user_id))
+                .single()
+            )
+            profile = result.data
+            is_admin = bool(profile and profile.get("is_admin"))
+        except Exception as exc:
+            logger.error(
+                "admin_check_failed",
                 user_id=str(user_id),
-                email=email,
+                error=str(exc),
             )
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Administrator access required",
-            )
-    except HTTPException:
-        raise
-    except Exception as exc:
-        logger.error(
-            "admin_check_failed",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to verify admin status",
+            ) from exc
+
+    await _cache_auth_result(
+        redis,
+        None if cached is not None else cache_key,
+        str(user_id),
+        email,
+        is_admin,
+        _cache_ttl(token),
+        store_admin_bit=not admin_bit_cached,
+    )
+
+    if not is_admin:
+        logger.warning(
+            "admin_access_denied",
             user_id=str(user_id),
-            error=str(exc),
+            email=email,
         )
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to verify admin status",
-        ) from exc
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required",
+        )
 
     logger.info("admin_authenticated", user_id=str(user_id), email=email)
 
@@ -11,12 +11,16 @@ Usage:
     settings = get_settings()
 """
 
-from functools import lru_cache
+from functools import cached_property
 from typing import Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Accepted SUPABASE_URL schemes: https:// (production) and loopback http://
+# (local Supabase CLI only).
+_SUPABASE_URL_PREFIXES = ("https://", "http://127.", "http://localhost")
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -25,6 +29,8 @@ class Settings(BaseSettings):
         case_sensitive=False,
         # Extra fields in .env are silently ignored — tolerates future additions.
         extra="ignore",
+        # Settings are a process-wide singleton — never mutated after startup.
+        frozen=True,
     )
 
     # ── Supabase ──────────────────────────────────────────────────────────────
@@ -32,12 +38,26 @@ class Settings(BaseSettings):
     supabase_service_role_key: str = Field(
         ..., description="Service Role Key — bypasses RLS. NEVER share with frontend."
     )
+    supabase_jwt_secret: str | None = Field(
+        default=None,
+        description="JWT secret (Dashboard → Settings → API). Enables local token verification.",
+    )
 
     # ── Redis ─────────────────────────────────────────────────────────────────
     redis_url: str = Field(
         default="redis://localhost:6379/0",
         description="Redis connection URL for the task queue",
     )
+    redis_health_check_interval: int = Field(
+        default=300,
+        ge=0,
+        description="Idle seconds after which redis-py PINGs a pooled connection before reuse (0 = never)",
+    )
+    redis_ping_interval: float = Field(
+        default=60.0,
+        ge=0,
+        description="Seconds between the API's background Redis PINGs (0 = disabled)",
+    )
 
     # ── Webhook security ──────────────────────────────────────────────────────
     # Optional in Phase 2; will be required in Phase 3 when Supabase webhook is live.
@@ -64,6 +84,32 @@ class Settings(BaseSettings):
         description="Override default LLM model name (e.g. 'gemini-2.0-flash', 'gpt-4o-mini')",
     )
 
+    # ── LLM Retries ───────────────────────────────────────────────────────────
+    # Exponential backoff with jitter between grading attempts; only rate limits,
+    # provider 5xx, timeouts and connection errors are retried.
+    llm_max_retries: int = Field(default=3, ge=0, description="Retries after the first grading attempt")
+    llm_base_delay: float = Field(default=1.0, ge=0, description="Backoff before the first retry (seconds)")
+    llm_max_delay: float = Field(default=30.0, ge=0, description="Upper bound on a single backoff (seconds)")
+    llm_jitter: float = Field(default=0.5, ge=0, description="Max random extra backoff, as a fraction of the delay")
+
+    # ── Grading worker ────────────────────────────────────────────────────────
+    grading_worker_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Submissions a grading worker process grades at once",
+    )
+    grading_worker_shutdown_grace: float = Field(
+        default=120.0,
+        ge=0,
+        description="Seconds in-flight gradings may run after SIGTERM/SIGINT before being cancelled",
+    )
+
+    # ── Grading cache ─────────────────────────────────────────────────────────
+    grading_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse validated LLM gradings for identical submissions (app/services/grading_cache.py)",
+    )
+
     # ── Application ───────────────────────────────────────────────────────────
     environment: Literal["development", "production"] = Field(
         default="development",
@@ -77,12 +123,13 @@ class Settings(BaseSettings):
     def supabase_url_must_be_valid(cls, v: str) -> str:
         # Allow both https:// (production) and http://127... (local Supabase CLI).
         # Plain strings without a scheme are always wrong.
-        if not v.startswith(("https://", "http://127.", "http://localhost")):
+        if not v.startswith(_SUPABASE_URL_PREFIXES):
             raise ValueError(
                 "SUPABASE_URL must start with https:// (production) or "
                 "http://127.x.x.x / http://localhost (local Supabase CLI only)"
             )
-        return v.rstrip("/")
+        # Only allocate a new string when there is a trailing slash to strip.
+        return v.rstrip("/") if v.endswith("/") else v
 
     @field_validator("supabase_service_role_key")
     @classmethod
@@ -94,16 +141,48 @@ class Settings(BaseSettings):
             )
         return v
 
-    @property
+    @classmethod
+    def fast_rebuild(cls) -> "Settings":
+        """Rebuild settings from the last validated values, skipping validation.
+
+        For test harnesses that spin up many app instances: the environment
+        is not re-read and validators do not run again. Falls back to a full
+        ``Settings()`` if nothing has been validated yet.
+        """
+        if _validated_fields is None:
+            return cls()
+        return cls.model_construct(**_validated_fields)
+
+    @cached_property
     def is_production(self) -> bool:
         return self.environment == "production"
 
+    @cached_property
+    def webhook_secret_bytes(self) -> bytes | None:
+        """``webhook_secret`` encoded once, for HMAC / constant-time comparison."""
+        return self.webhook_secret.encode() if self.webhook_secret else None
+
+
+_settings: Settings | None = None
+# Field values of the first successfully validated Settings (see ``fast_rebuild``).
+_validated_fields: dict | None = None
+
 
-@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return (and cache) the application settings singleton.
+    """Return the application settings singleton.
 
-    The cache means settings are validated once at first call.
-    Use `get_settings.cache_clear()` in tests to reload from a fresh environment.
+    Settings are built (and validated) lazily on first call, never at import.
+    Use ``reset_settings()`` in tests to reload from a fresh environment.
     """
-    return Settings()
+    global _settings, _validated_fields
+    if _settings is None:
+        _settings = Settings()
+        if _validated_fields is None:
+            _validated_fields = _settings.model_dump()
+    return _settings
+
+
+def reset_settings() -> None:
+    """Drop the cached settings so the next ``get_settings()`` re-reads the environment."""
+    global _settings
+    _settings = None
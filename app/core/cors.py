@@ -0,0 +1,108 @@
+"""
+app/core/cors.py
+
+Minimal CORS middleware for the production single-origin case.
+
+Starlette's ``CORSMiddleware`` handles origin lists, regexes and wildcards,
+and rebuilds its header dicts on every cross-origin request. Production only
+ever allows the frontend origin, so this middleware compares the ``Origin``
+header with a single ``==`` and splices precomputed header bytes into the
+response. Behaviour matches ``CORSMiddleware`` configured with one origin,
+``allow_credentials=True`` and ``allow_headers=["*"]``:
+
+  - Every response gets ``Vary: Origin`` (the CORS headers depend on it).
+  - No ``Origin`` header, or a foreign origin on a simple request → no other
+    CORS headers (the browser enforces the block).
+  - Preflight (``OPTIONS`` + ``Access-Control-Request-Method``) → answered
+    here: 200 for the allowed origin/method, 400 otherwise.
+  - Allowed origin → ``Access-Control-Allow-Origin`` and
+    ``Access-Control-Allow-Credentials`` added to the response.
+
+Development keeps Starlette's ``CORSMiddleware`` (``allow_origins=["*"]``).
+"""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Seconds browsers may cache a preflight result (Starlette's default).
+CORS_PREFLIGHT_MAX_AGE = 600
+
+
+class SingleOriginCORSMiddleware:
+    """CORS for exactly one allowed origin, with precomputed header bytes."""
+
+    def __init__(self, app: ASGIApp, origin: str, allow_methods: list[str]) -> None:
+        self.app = app
+        self.origin = origin.encode("latin-1")
+        self.allow_methods = frozenset(m.encode("latin-1") for m in allow_methods)
+
+        self.vary_headers = [(b"vary", b"Origin")]
+        self.simple_headers = [
+            (b"access-control-allow-origin", self.origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        self.preflight_headers = [
+            (
+                b"vary",
+                b"Origin, Access-Control-Request-Method, Access-Control-Request-Headers",
+            ),
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(CORS_PREFLIGHT_MAX_AGE).encode()),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is not None and scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(send, origin, request_method, request_headers)
+            return
+
+        extra_headers = self.simple_headers if origin == self.origin else self.vary_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(
+        self,
+        send: Send,
+        origin: bytes,
+        request_method: bytes,
+        request_headers: bytes | None,
+    ) -> None:
+        """Answer a CORS preflight directly, without reaching the app."""
+        headers = list(self.preflight_headers)
+        if origin == self.origin:
+            headers.append((b"access-control-allow-origin", self.origin))
+
+        if origin != self.origin:
+            status, body = 400, b"Disallowed CORS origin"
+        elif request_method not in self.allow_methods:
+            status, body = 400, b"Disallowed CORS method"
+        else:
+            status, body = 200, b"OK"
+            if request_headers:
+                # allow_headers=["*"] with credentials → echo what was requested.
+                headers.append((b"access-control-allow-headers", request_headers))
+
+        headers += [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
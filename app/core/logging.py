@@ -3,7 +3,10 @@ app/core/logging.py
 
 Structured logging setup using structlog.
 
-- In production: outputs newline-delimited JSON (parseable by Railway/Render/Datadog).
+- In production: outputs newline-delimited JSON (parseable by Railway/Render/Datadog),
+  serialized with orjson and written as raw bytes straight to stdout's binary
+  buffer. Each line is flushed as it is written, so logs are never held back,
+  survive a hard kill, and stay in order with stdlib/uvicorn records.
 - In development: outputs coloured, human-readable console lines with timestamps.
 
 Usage:
@@ -15,12 +18,24 @@ Never use print() anywhere in the application — always use a logger.
 """
 
 import logging
+import random
 import sys
+from functools import lru_cache
 
+import orjson
 import structlog
 from structlog.types import EventDict, Processor
 
 
+def flush_logs() -> None:
+    """Flush stdout at shutdown. Safe to call at any time.
+
+    Log lines are already flushed as they are written; this only catches
+    anything third-party code left in stdout's buffer.
+    """
+    sys.stdout.flush()
+
+
 def _drop_color_message_key(_, __, event_dict: EventDict) -> EventDict:
     """Remove the `color_message` key injected by uvicorn's ColourizedFormatter
     when structlog intercepts its log records — avoids duplication in JSON output."""
@@ -28,6 +43,32 @@ def _drop_color_message_key(_, __, event_dict: EventDict) -> EventDict:
     return event_dict
 
 
+# Processor chains are built once at import — ``setup_logging`` only picks one.
+_SHARED_PROCESSORS: tuple[Processor, ...] = (
+    # Inject the log level (DEBUG, INFO, …) into the event dict.
+    structlog.stdlib.add_log_level,
+    # Add ISO-8601 timestamp.
+    structlog.processors.TimeStamper(fmt="iso"),
+    _drop_color_message_key,
+)
+
+# JSON output — one object per line, parseable by log aggregators.
+_PROD_PROCESSORS: tuple[Processor, ...] = (
+    *_SHARED_PROCESSORS,
+    structlog.processors.dict_tracebacks,
+    structlog.processors.JSONRenderer(serializer=orjson.dumps),
+)
+
+# Human-readable coloured output for local development. ``stack_info=True`` is
+# a debugging aid, so it is only rendered here; production exceptions are
+# captured by ``dict_tracebacks``.
+_DEV_PROCESSORS: tuple[Processor, ...] = (
+    *_SHARED_PROCESSORS,
+    structlog.processors.StackInfoRenderer(),
+    structlog.dev.ConsoleRenderer(colors=True),
+)
+
+
 def setup_logging(environment: str = "development") -> None:
     """Configure structlog and stdlib logging.
 
@@ -38,33 +79,23 @@ def setup_logging(environment: str = "development") -> None:
     """
     is_production = environment == "production"
 
-    shared_processors: list[Processor] = [
-        # Inject the log level (DEBUG, INFO, …) into the event dict.
-        structlog.stdlib.add_log_level,
-        # Add ISO-8601 timestamp.
-        structlog.processors.TimeStamper(fmt="iso"),
-        # Render exception tracebacks if present.
-        structlog.processors.StackInfoRenderer(),
-        _drop_color_message_key,
-    ]
-
     if is_production:
-        # JSON output — one object per line, parseable by log aggregators.
-        processors: list[Processor] = shared_processors + [
-            structlog.processors.dict_tracebacks,
-            structlog.processors.JSONRenderer(),
-        ]
+        # orjson renders bytes, so the logger writes straight to the binary
+        # stdout buffer (no bytes → str → bytes round-trip).
+        processors = _PROD_PROCESSORS
+        logger_factory = structlog.BytesLoggerFactory(file=sys.stdout.buffer)
     else:
-        # Human-readable coloured output for local development.
-        processors = shared_processors + [
-            structlog.dev.ConsoleRenderer(colors=True),
-        ]
+        processors = _DEV_PROCESSORS
+        logger_factory = structlog.PrintLoggerFactory(file=sys.stdout)
 
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(logging.DEBUG),
+        # Below this level, log calls are no-op methods — no processor runs.
+        wrapper_class=structlog.make_filtering_bound_logger(
+            logging.INFO if is_production else logging.DEBUG
+        ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=sys.stdout),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
@@ -80,11 +111,25 @@ def setup_logging(environment: str = "development") -> None:
         logging.getLogger(name).propagate = True
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
     """Return a structlog bound logger for the given module name.
 
+    Cached per name — every caller with the same name shares one logger proxy.
+
     Usage:
         logger = get_logger(__name__)
         logger.info("event_name", key="value")
     """
     return structlog.get_logger(name)
+
+
+def sampled_info(logger: structlog.stdlib.BoundLogger, rate: float, event: str, **kw) -> None:
+    """Emit an info event for roughly ``rate`` of calls (0.0–1.0).
+
+    For high-frequency, low-value events such as load-balancer health probes.
+    The sample rate is attached to the event so counts can be scaled back up.
+    Never use this for warnings, errors, or audit events.
+    """
+    if random.random() < rate:
+        logger.info(event, sample_rate=rate, **kw)
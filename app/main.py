@@ -7,25 +7,42 @@ Startup sequence (via lifespan):
   1. Logging is configured (JSON in prod, coloured console in dev).
   2. Supabase client is created and connectivity-probed (fails fast on bad creds).
   3. Redis connection pool is created and PINGed (fails fast if unreachable).
-  4. Both clients are stored on ``app.state`` for injection into endpoints.
+  4. The shared outbound HTTP pool (GitHub API, …) is created.
+  5. The admin user set is preloaded; a watcher reloads it on a timer and
+     on pub/sub announcements.
+  6. The resolved settings and all clients are stored on ``app.state`` for
+     injection into endpoints.
+  7. The OpenAPI schema is generated once so the first ``/openapi.json`` or
+     ``/docs`` load does not stall a request.
 
 Shutdown sequence (via lifespan):
-  1. Redis connection pool is gracefully closed.
+  1. The admin-set watcher is cancelled.
+  2. The cached chat models are dropped, then the outbound HTTP pool and
+     the Supabase HTTP pool are closed.
+  3. Redis connection pool is gracefully closed.
+  4. Buffered log lines are flushed to stdout.
 
 Environment variables are loaded by Pydantic Settings from ``.env`` — there
 is no ``load_dotenv()`` call here. Do not add one.
 """
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.v1 import admin, grade, health, hint
+from app.core.auth import load_admin_ids, watch_admin_changes
 from app.core.config import get_settings
-from app.core.logging import get_logger, setup_logging
-from app.services.redis_client import close_redis, init_redis
-from app.services.supabase import init_supabase
+from app.core.cors import SingleOriginCORSMiddleware
+from app.core.logging import flush_logs, get_logger, setup_logging
+from app.services.http_client import close_http_client, init_http_client
+from app.services.llm import reset_llm_cache
+from app.services.redis_client import close_redis, init_redis, watch_redis
+from app.services.supabase import close_supabase, init_supabase
 
 
 @asynccontextmanager
@@ -50,8 +67,22 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         environment=settings.environment,
     )
 
+    app.state.settings = settings
     app.state.supabase = await init_supabase()
     app.state.redis = await init_redis()
+    app.state.hint_rate_limit = hint.register_rate_limit_script(app.state.redis)
+    app.state.http = await init_http_client()
+    app.state.admins = await load_admin_ids(app.state.supabase)
+    admin_watcher = asyncio.create_task(watch_admin_changes(app.state))
+    redis_watcher = (
+        asyncio.create_task(watch_redis(app.state.redis, settings.redis_ping_interval))
+        if settings.redis_ping_interval
+        else None
+    )
+
+    # FastAPI caches the result on ``app.openapi_schema``. Production still
+    # serves /openapi.json, so it is built there too.
+    app.openapi()
 
     logger.info("app_ready", message="All services connected. Accepting requests.")
 
@@ -59,8 +90,19 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # ── Shutdown ──────────────────────────────────────────────────────────────
     logger.info("app_shutdown", message="Shutting down gracefully...")
+    for watcher in (admin_watcher, redis_watcher):
+        if watcher is None:
+            continue
+        watcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watcher
+    # The cached chat models hold this pool; a later lifespan must rebuild them.
+    reset_llm_cache()
+    await close_http_client(app.state.http)
+    close_supabase(app.state.supabase)
     await close_redis(app.state.redis)
     logger.info("app_stopped")
+    flush_logs()
 
 
 def create_app() -> FastAPI:
@@ -85,26 +127,24 @@ def create_app() -> FastAPI:
     )
 
     # ── CORS ──────────────────────────────────────────────────────────────────
-    # Restrict to the frontend origin in production.
+    # Restrict to the frontend origin in production (single-origin fast path).
     # In development, allow all origins so the Astro dev server at any port works.
-    origins = (
-        ["*"]
-        if not settings.is_production
-        else [
-            "https://cs4all-vn.vercel.app",
-        ]
-    )
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=origins,
-        allow_credentials=True,
-        allow_methods=["GET", "POST"],
-        allow_headers=["*"],
-    )
+    if settings.is_production:
+        app.add_middleware(
+            SingleOriginCORSMiddleware,
+            origin="https://cs4all-vn.vercel.app",
+            allow_methods=["GET", "POST"],
+        )
+    else:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["*"],
+            allow_credentials=True,
+            allow_methods=["GET", "POST"],
+            allow_headers=["*"],
+        )
 
     # ── Routers ───────────────────────────────────────────────────────────────
-    from app.api.v1 import admin, grade, health, hint  # noqa: PLC0415  (deferred import avoids circular deps at configure time)
-
     app.include_router(health.router, prefix="/api/v1", tags=["Health"])
     app.include_router(grade.router, prefix="/api/v1", tags=["Grading"])
     app.include_router(admin.router, prefix="/api/v1", tags=["Admin"])
@@ -13,6 +13,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.schemas.grading import Score
+
 
 # ── Request models ─────────────────────────────────────────────────────────────
 
@@ -20,7 +22,7 @@ from pydantic import BaseModel, ConfigDict, Field
 class ReviewRequest(BaseModel):
     """Body of POST /api/v1/admin/submissions/{id}/review."""
 
-    reviewer_score: int = Field(..., ge=0, le=100, description="Human reviewer's score (0-100)")
+    reviewer_score: Score = Field(..., description="Human reviewer's score (0-100)")
 
 
 # ── Response models ────────────────────────────────────────────────────────────
@@ -50,12 +52,48 @@ class SubmissionDetail(BaseModel):
     reviewed_at: datetime | None = None
 
 
+class ProfileLite(BaseModel):
+    """Submitter profile embedded in list rows (``public.profiles`` subset)."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    display_name: str | None = None
+    avatar_url: str | None = None
+
+
+class SubmissionSummary(BaseModel):
+    """A lightweight submission row for the list view.
+
+    Omits the large text/JSON columns (``content``, ``llm_feedback``) — fetch
+    ``SubmissionDetail`` via GET /api/v1/admin/submissions/{id} for those.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    id: UUID
+    user_id: UUID
+    lesson_id: str
+
+    llm_score: int | None = None
+    reviewer_score: int | None = None
+    final_score: int | None = None
+
+    status: str
+    submitted_at: datetime
+
+    # Embedded by PostgREST in the same query — never fetch per row.
+    user: ProfileLite | None = None
+
+
 class SubmissionListResponse(BaseModel):
-    """Response for GET /api/v1/admin/submissions — paginated list."""
+    """Response for GET /api/v1/admin/submissions — keyset-paginated list.
+
+    ``next_cursor`` is opaque; pass it back as ``?cursor=`` to fetch the next page.
+    """
 
-    submissions: list[SubmissionDetail]
-    total: int
-    page: int
+    submissions: list[SubmissionSummary]
+    next_cursor: str | None = None
+    has_more: bool
     page_size: int
 
 
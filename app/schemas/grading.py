@@ -15,12 +15,21 @@ Rules:
 """
 
 from datetime import datetime
-from typing import Literal
+from typing import Annotated, Literal
 from uuid import UUID
 
+from annotated_types import Ge, Le
 from pydantic import BaseModel, ConfigDict, Field
 
 
+# ── Constrained types (shared with app/schemas/admin.py) ──────────────────────
+
+# A 0–100 score (LLM overall score, human reviewer score).
+Score = Annotated[int, Ge(0), Le(100)]
+# Rubric points — never negative.
+Points = Annotated[int, Ge(0)]
+
+
 # ── Supabase Webhook Payload ───────────────────────────────────────────────────
 
 
@@ -93,8 +102,8 @@ class FeedbackItem(BaseModel):
     model_config = ConfigDict(extra="forbid")  # strict: LLM must not hallucinate fields
 
     criterion: str = Field(..., description="Must match rubric criterion name exactly")
-    points_awarded: int = Field(..., ge=0)
-    points_possible: int = Field(..., ge=0)
+    points_awarded: Points
+    points_possible: Points
     comment: str
 
 
@@ -111,7 +120,7 @@ class GradingResponse(BaseModel):
 
     model_config = ConfigDict(extra="forbid")
 
-    overall_score: int = Field(..., ge=0, le=100)
+    overall_score: Score
     feedback: list[FeedbackItem] = Field(..., min_length=1)
 
 
@@ -4,7 +4,18 @@ app/schemas/hint.py
 Pydantic models for the LLM hint API endpoint.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class AnchorItem(BaseModel):
+    """One referenceable element (equation, definition, …) of the lesson page."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    id: str
+    label: str = ""
+    type: str = ""
+    preview: str = ""
 
 
 class HintRequest(BaseModel):
@@ -22,7 +33,7 @@ class HintRequest(BaseModel):
         min_length=1,
         max_length=2000,
     )
-    anchor_map: list[dict] = Field(
+    anchor_map: list[AnchorItem] = Field(
         default_factory=list,
         description="List of anchor elements from the lesson containing id, label, type, and preview"
     )
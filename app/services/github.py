@@ -11,12 +11,17 @@ Rules (from AGENTS.md Section 3.7):
     - Uses GITHUB_TOKEN from settings for authenticated access (higher rate limits).
 """
 
-import base64
-import json
+import asyncio
 import re
-from dataclasses import dataclass, field
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from types import MappingProxyType
 
 import httpx
+import orjson
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
@@ -25,12 +30,35 @@ logger = get_logger(__name__)
 
 GITHUB_API_BASE = "https://api.github.com"
 CONTENT_REPO = "vietfood/cs4all-content"
-
-# In-memory cache: {file_path: raw_content}
-_content_cache: dict[str, str] = {}
-
-
-@dataclass
+GITHUB_TIMEOUT = 30.0  # seconds
+
+# In-memory LRU cache: {file_path: (cached_at, etag, raw_bytes, exercises)}.
+# Bounded so a long-lived worker does not hold every MDX file it has ever
+# graded. Entries older than the TTL are revalidated with If-None-Match rather
+# than refetched. Files are kept as the UTF-8 bytes GitHub sent: Vietnamese
+# text is stored as 2 bytes/char in a ``str`` but ~1.2 in UTF-8, so the cache
+# is ~40% smaller and a hit pays one C-level decode.
+# ``exercises`` memoizes the file's parsed ExerciseContent by exercise id; it
+# lives and dies with the bytes it was parsed from (kept on a 304, reset when
+# the file changes).
+CONTENT_CACHE_MAX_ENTRIES = 256
+CONTENT_CACHE_TTL = 3600  # seconds
+_CachedFile = tuple[float, str, bytes, dict[str, "ExerciseContent"]]
+_content_cache: OrderedDict[str, _CachedFile] = OrderedDict()
+
+# In-flight downloads, so concurrent misses for one file share a single request.
+_inflight_fetches: dict[str, asyncio.Task[_CachedFile]] = {}
+
+# Redis cache for parsed LessonContext (hint endpoint): a hash per page holding
+# {etag, context, fetched_at}. Entries are served as-is while fresh; after that
+# they are revalidated with If-None-Match (a 304 costs no GitHub rate limit),
+# and kept as a fallback if GitHub is unreachable.
+LESSON_CACHE_PREFIX = "cs4all:lesson"
+LESSON_CACHE_FRESH_TTL = 30  # seconds
+LESSON_CACHE_MAX_AGE = 86400  # seconds — fallback window
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class ExerciseContent:
     """Parsed exercise content from the MDX file."""
 
@@ -73,36 +101,41 @@ def _parse_lesson_id(lesson_id: str) -> tuple[str, str | None]:
     return file_path, exercise_id
 
 
-async def _fetch_file_from_github(file_path: str) -> str:
-    """Fetch a file from the content repo via GitHub Contents API.
-
-    Uses in-memory caching to avoid repeated API calls for the same file.
+async def _github_get(
+    file_path: str,
+    etag: str | None = None,
+    http: httpx.AsyncClient | None = None,
+) -> httpx.Response:
+    """GET a file from the content repo via the GitHub Contents API.
 
-    Args:
-        file_path: Relative path within the content repo.
-
-    Returns:
-        The raw file content as a string.
+    The raw media type makes GitHub return the file bytes as the body instead
+    of a JSON envelope with base64 ``content`` — no JSON parse, no base64
+    decode, and a third fewer bytes on the wire. If ``etag`` is given the
+    request is conditional and may return 304. ``http`` is the shared pooled
+    client; without it a one-off client is used.
 
     Raises:
-        ExerciseFetchError: If the file cannot be fetched.
+        ExerciseFetchError: If the request fails or returns an error status.
     """
-    if file_path in _content_cache:
-        logger.debug("github_cache_hit", file_path=file_path)
-        return _content_cache[file_path]
-
     settings = get_settings()
     url = f"{GITHUB_API_BASE}/repos/{CONTENT_REPO}/contents/{file_path}"
 
     headers: dict[str, str] = {
-        "Accept": "application/vnd.github.v3+json",
+        "Accept": "application/vnd.github.v3.raw",
     }
     if settings.github_token:
         headers["Authorization"] = f"Bearer {settings.github_token}"
+    if etag:
+        headers["If-None-Match"] = etag
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, headers=headers)
+        if http is None:
+            async with httpx.AsyncClient(timeout=GITHUB_TIMEOUT) as client:
+                response = await client.get(url, headers=headers)
+        else:
+            response = await http.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
+        # httpx treats 304 as a redirect and would raise on it.
+        if response.status_code != httpx.codes.NOT_MODIFIED:
             response.raise_for_status()
     except httpx.HTTPStatusError as exc:
         logger.error(
@@ -124,59 +157,196 @@ async def _fetch_file_from_github(file_path: str) -> str:
             f"GitHub API request failed for {file_path}: {exc}"
         ) from exc
 
-    data = response.json()
+    return response
 
-    # GitHub returns base64-encoded content
-    raw_content = base64.b64decode(data["content"]).decode("utf-8")
 
-    # Cache for the worker's lifetime
-    _content_cache[file_path] = raw_content
-    logger.info("github_file_fetched", file_path=file_path, size=len(raw_content))
+def _content_cache_put(
+    file_path: str,
+    etag: str,
+    raw_bytes: bytes,
+    exercises: dict[str, "ExerciseContent"] | None = None,
+) -> _CachedFile:
+    """Insert a file, evicting the least recently used entries past the bound."""
+    entry = (time.monotonic(), etag, raw_bytes, {} if exercises is None else exercises)
+    _content_cache[file_path] = entry
+    _content_cache.move_to_end(file_path)
+    while len(_content_cache) > CONTENT_CACHE_MAX_ENTRIES:
+        _content_cache.popitem(last=False)
+    return entry
 
-    return raw_content
 
-def _extract_frontmatter_field(mdx_content: str, field_name: str) -> str | None:
-    """Extract a field value from MDX YAML frontmatter.
+async def _download_file(file_path: str, http: httpx.AsyncClient | None) -> _CachedFile:
+    """GET (or revalidate) a file and store it in ``_content_cache``."""
+    stale = _content_cache.get(file_path)
+    etag = stale[1] if stale else None
+
+    response = await _github_get(file_path, etag=etag or None, http=http)
+
+    if response.status_code == httpx.codes.NOT_MODIFIED and stale is not None:
+        logger.debug("github_file_revalidated", file_path=file_path)
+        # Unchanged — keep the bytes and the exercises already parsed from them.
+        return _content_cache_put(file_path, stale[1], stale[2], stale[3])
+
+    raw_bytes = response.content
+    logger.info("github_file_fetched", file_path=file_path, size=len(raw_bytes))
+    return _content_cache_put(file_path, response.headers.get("ETag", ""), raw_bytes)
+
 
-    Handles both single-line values and multi-line block scalars (using |).
-    Uses simple string parsing to avoid adding a PyYAML dependency.
+async def _fetch_cached_file(
+    file_path: str,
+    http: httpx.AsyncClient | None = None,
+) -> _CachedFile:
+    """Return the ``_content_cache`` entry for a file, fetching it if needed.
+
+    See ``_fetch_file_from_github`` for the caching behaviour.
+    """
+    entry = _content_cache.get(file_path)
+    if entry is not None and time.monotonic() - entry[0] <= CONTENT_CACHE_TTL:
+        _content_cache.move_to_end(file_path)
+        logger.debug("github_cache_hit", file_path=file_path)
+        return entry
+
+    task = _inflight_fetches.get(file_path)
+    if task is None:
+        task = asyncio.create_task(_download_file(file_path, http))
+        _inflight_fetches[file_path] = task
+        task.add_done_callback(lambda _: _inflight_fetches.pop(file_path, None))
+    else:
+        logger.debug("github_fetch_coalesced", file_path=file_path)
+
+    # Shielded: one cancelled caller must not cancel the shared download.
+    return await asyncio.shield(task)
+
+
+async def _fetch_file_from_github(
+    file_path: str,
+    http: httpx.AsyncClient | None = None,
+) -> str:
+    """Fetch a file from the content repo via GitHub Contents API.
+
+    Uses a bounded in-memory LRU cache (``CONTENT_CACHE_MAX_ENTRIES`` entries,
+    ``CONTENT_CACHE_TTL`` seconds) to avoid repeated API calls for the same
+    file; expired entries are revalidated with their ETag (a 304 has no body
+    and costs no rate limit). Concurrent misses are coalesced into one request.
 
     Args:
-        mdx_content: The full raw MDX file content.
-        field_name: The frontmatter field name to extract.
+        file_path: Relative path within the content repo.
+        http: Optional shared HTTP client (see app/services/http_client.py).
 
     Returns:
-        The field value as a string, or None if not found.
+        The raw file content as a string.
+
+    Raises:
+        ExerciseFetchError: If the file cannot be fetched.
     """
-    # Frontmatter is between the first two '---' lines
-    parts = mdx_content.split("---", 2)
-    if len(parts) < 3:
+    entry = await _fetch_cached_file(file_path, http=http)
+    return entry[2].decode("utf-8")
+
+
+def _frontmatter_bounds(mdx_content: str) -> tuple[int, int] | None:
+    """Locate the frontmatter between the first two ``---`` in raw MDX.
+
+    Returns ``(start, end)`` such that ``mdx_content[start:end]`` is the
+    frontmatter and the body begins at ``end + 3``, or None when the file has
+    no frontmatter block. Two ``str.find`` calls — unlike ``split("---", 2)``
+    nothing is copied, so callers slice only the part they need.
+    """
+    start = mdx_content.find("---")
+    if start == -1:
+        return None
+    end = mdx_content.find("---", start + 3)
+    if end == -1:
         return None
+    return start + 3, end
 
-    frontmatter = parts[1]
 
-    # Try multi-line block scalar first: "field: |" followed by indented lines
-    block_pattern = re.compile(
-        rf'^{re.escape(field_name)}:\s*\|\s*\n((?:\s+.+\n?)+)',
-        re.MULTILINE,
-    )
-    block_match = block_pattern.search(frontmatter)
-    if block_match:
-        # Dedent the block content
-        lines = block_match.group(1).split("\n")
-        dedented = "\n".join(line.strip() for line in lines if line.strip())
-        return dedented
-
-    # Try single-line: "field: value" or 'field: "value"'
-    line_pattern = re.compile(
-        rf'^{re.escape(field_name)}:\s*["\']?(.+?)["\']?\s*$',
-        re.MULTILINE,
-    )
-    line_match = line_pattern.search(frontmatter)
-    if line_match:
-        return line_match.group(1).strip()
+def _parse_frontmatter(mdx_content: str) -> Mapping[str, str]:
+    """Parse the top-level fields of an MDX file's YAML frontmatter.
+
+    Args:
+        mdx_content: The full raw MDX file content.
+
+    Returns:
+        Read-only mapping of field name to value. Fields with an empty value
+        are omitted.
+    """
+    bounds = _frontmatter_bounds(mdx_content)
+    if bounds is None:
+        return {}
+    return _parse_frontmatter_block(mdx_content[bounds[0]:bounds[1]])
+
+
+@lru_cache(maxsize=CONTENT_CACHE_MAX_ENTRIES)
+def _parse_frontmatter_block(frontmatter: str) -> Mapping[str, str]:
+    """Parse frontmatter text (between the ``---`` lines) in one pass.
+
+    Handles single-line values (optionally quoted) and block scalars
+    (``field: |`` followed by indented lines, which are dedented and joined).
+    A line-by-line walk rather than PyYAML or per-field regexes: the lesson
+    and grading paths read several fields from the same file. Cached on the
+    frontmatter text alone, so the cache never pins whole MDX documents.
+    """
+    fields: dict[str, str] = {}
+    block_key: str | None = None
+    block_lines: list[str] = []
+
+    for line in frontmatter.split("\n"):
+        if block_key is not None:
+            stripped = line.strip()
+            if not stripped or line[0].isspace():
+                if stripped:
+                    block_lines.append(stripped)
+                continue
+            # First unindented line closes the block scalar.
+            if block_lines:
+                fields.setdefault(block_key, "\n".join(block_lines))
+            block_key = None
+
+        key, sep, value = line.partition(":")
+        if not sep or not key or key[0].isspace():
+            continue
+        value = value.strip()
+        if value == "|":
+            block_key, block_lines = key, []
+            continue
+
+        # Drop one surrounding quote on either side: 'field: "value"'
+        if value[:1] in ("'", '"'):
+            value = value[1:]
+        if value[-1:] in ("'", '"'):
+            value = value[:-1]
+        value = value.strip()
+        if value:
+            fields.setdefault(key, value)
+
+    if block_key is not None and block_lines:
+        fields.setdefault(block_key, "\n".join(block_lines))
+
+    return MappingProxyType(fields)
+
+
+def _extract_frontmatter_field(mdx_content: str, field_name: str) -> str | None:
+    """Return one frontmatter field (see ``_parse_frontmatter``), or None if absent."""
+    return _parse_frontmatter(mdx_content).get(field_name)
 
-    return None
+
+# Tags inside an <ExerciseBlock>, compiled once.
+_QUESTION_RE = re.compile(r'<Question>(.*?)</Question>', re.DOTALL)
+_SOLUTION_RE = re.compile(r'<Solution>(.*?)</Solution>', re.DOTALL)
+_RUBRIC_RE = re.compile(r'<Rubric[^>]*>(.*?)</Rubric>', re.DOTALL)
+# Markdown code fence lines (```json ... ```) around a rubric.
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*\n|\n```\s*$", re.MULTILINE)
+
+
+@lru_cache(maxsize=256)
+def _exercise_block_re(exercise_id: str) -> re.Pattern[str]:
+    """Pattern for ``<ExerciseBlock id="X" ...> ... </ExerciseBlock>``, cached per id."""
+    return re.compile(
+        rf'<ExerciseBlock\s[^>]*id="{re.escape(exercise_id)}"[^>]*>'
+        r'(.*?)'
+        r'</ExerciseBlock>',
+        re.DOTALL,
+    )
 
 
 def _extract_exercise_block(mdx_content: str, exercise_id: str) -> dict[str, str]:
@@ -198,13 +368,7 @@ def _extract_exercise_block(mdx_content: str, exercise_id: str) -> dict[str, str
     """
     # Find the ExerciseBlock with matching id
     # Pattern: <ExerciseBlock id="1-1" ...> ... </ExerciseBlock>
-    block_pattern = re.compile(
-        rf'<ExerciseBlock\s[^>]*id="{re.escape(exercise_id)}"[^>]*>'
-        r'(.*?)'
-        r'</ExerciseBlock>',
-        re.DOTALL,
-    )
-    match = block_pattern.search(mdx_content)
+    match = _exercise_block_re(exercise_id).search(mdx_content)
     if not match:
         raise ExerciseFetchError(
             f"ExerciseBlock with id='{exercise_id}' not found in MDX"
@@ -213,21 +377,15 @@ def _extract_exercise_block(mdx_content: str, exercise_id: str) -> dict[str, str
     block_content = match.group(1)
 
     # Extract <Question>...</Question>
-    question_match = re.search(
-        r'<Question>(.*?)</Question>', block_content, re.DOTALL
-    )
+    question_match = _QUESTION_RE.search(block_content)
     question = question_match.group(1).strip() if question_match else ""
 
     # Extract <Solution>...</Solution>
-    solution_match = re.search(
-        r'<Solution>(.*?)</Solution>', block_content, re.DOTALL
-    )
+    solution_match = _SOLUTION_RE.search(block_content)
     solution = solution_match.group(1).strip() if solution_match else ""
 
     # Extract <Rubric hidden>...</Rubric>
-    rubric_match = re.search(
-        r'<Rubric[^>]*>(.*?)</Rubric>', block_content, re.DOTALL
-    )
+    rubric_match = _RUBRIC_RE.search(block_content)
     rubric_raw = rubric_match.group(1).strip() if rubric_match else ""
 
     # Extract grading_context from page frontmatter (between --- delimiters)
@@ -257,13 +415,16 @@ def _parse_rubric_json(rubric_raw: str) -> list[dict] | None:
     if not rubric_raw:
         return None
 
-    # Strip out any potential markdown code block syntax
-    clean_json_str = re.sub(r"^```(?:json)?\s*\n|\n```\s*$", "", rubric_raw.strip(), flags=re.MULTILINE)
+    # Strip out any potential markdown code block syntax. Most rubrics are
+    # bare JSON, so the substitution only runs when a fence is present.
+    clean_json_str = rubric_raw.strip()
+    if "```" in clean_json_str:
+        clean_json_str = _CODE_FENCE_RE.sub("", clean_json_str)
 
     try:
-        data = json.loads(clean_json_str)
+        data = orjson.loads(clean_json_str)
         return data.get("criteria", [])
-    except json.JSONDecodeError as exc:
+    except orjson.JSONDecodeError as exc:
         logger.warning(
             "rubric_parse_failed",
             error=str(exc),
@@ -272,13 +433,30 @@ def _parse_rubric_json(rubric_raw: str) -> list[dict] | None:
         return None
 
 
-async def fetch_exercise_content(lesson_id: str) -> ExerciseContent:
+def _parse_exercise(raw_mdx: str, exercise_id: str) -> ExerciseContent:
+    """Extract one exercise from a file's raw MDX."""
+    parts = _extract_exercise_block(raw_mdx, exercise_id)
+
+    return ExerciseContent(
+        exercise_id=exercise_id,
+        question=parts["question"],
+        solution=parts["solution"] or None,
+        rubric_criteria=_parse_rubric_json(parts["rubric_raw"]),
+        grading_context=parts.get("grading_context"),
+    )
+
+
+async def fetch_exercise_content(
+    lesson_id: str,
+    http: httpx.AsyncClient | None = None,
+) -> ExerciseContent:
     """Fetch and parse exercise content from the GitHub content repo.
 
     This is the main entrypoint called by the grading worker.
 
     Args:
         lesson_id: The exercise lesson ID (e.g., "prml/1-exercise#1-1").
+        http: Optional shared HTTP client (see app/services/http_client.py).
 
     Returns:
         ExerciseContent with question, solution, and rubric criteria.
@@ -300,30 +478,70 @@ async def fetch_exercise_content(lesson_id: str) -> ExerciseContent:
         exercise_id=exercise_id,
     )
 
-    raw_mdx = await _fetch_file_from_github(file_path)
-    parts = _extract_exercise_block(raw_mdx, exercise_id)
-    rubric_criteria = _parse_rubric_json(parts["rubric_raw"])
-
-    exercise = ExerciseContent(
-        exercise_id=exercise_id,
-        question=parts["question"],
-        solution=parts["solution"] or None,
-        rubric_criteria=rubric_criteria,
-        grading_context=parts.get("grading_context"),
-    )
+    # Parsed exercises are memoized on the file's cache entry, so a cohort
+    # submitting the same exercise back-to-back skips the block extraction and
+    # rubric parse as well as the download.
+    entry = await _fetch_cached_file(file_path, http=http)
+    exercise = entry[3].get(exercise_id)
+    if exercise is None:
+        exercise = _parse_exercise(entry[2].decode("utf-8"), exercise_id)
+        entry[3][exercise_id] = exercise
+
+    if exercise.rubric_criteria:
+        # The memoized instance is shared — give each caller its own rubric.
+        exercise = replace(
+            exercise, rubric_criteria=[dict(c) for c in exercise.rubric_criteria]
+        )
 
     logger.info(
         "exercise_parsed",
         exercise_id=exercise_id,
         question_length=len(exercise.question),
         has_solution=bool(exercise.solution),
-        rubric_count=len(rubric_criteria) if rubric_criteria else 0,
+        rubric_count=len(exercise.rubric_criteria) if exercise.rubric_criteria else 0,
     )
 
     return exercise
 
 
-@dataclass
+async def prefetch_exercise_files(
+    lesson_ids: Iterable[str],
+    http: httpx.AsyncClient | None = None,
+) -> None:
+    """Warm the in-memory content cache for a batch of submissions.
+
+    Fetches each distinct MDX file concurrently, so a batch that spans several
+    lesson pages waits for one round-trip instead of one per page. Failures are
+    ignored here — ``fetch_exercise_content`` will hit (and report) them again
+    for the submission that needs the file.
+
+    Args:
+        lesson_ids: Exercise lesson IDs (e.g., "prml/1-exercise#1-1").
+        http: Optional shared HTTP client (see app/services/http_client.py).
+    """
+    file_paths = {_parse_lesson_id(lesson_id)[0] for lesson_id in lesson_ids if lesson_id}
+    if not file_paths:
+        return
+
+    results = await asyncio.gather(
+        *(_fetch_file_from_github(path, http=http) for path in file_paths),
+        return_exceptions=True,
+    )
+    logger.debug(
+        "exercise_files_prefetched",
+        files=len(file_paths),
+        failed=sum(isinstance(r, BaseException) for r in results),
+    )
+
+
+# An MDX import statement ("import X from '...'") with the newline before it:
+# a line whose stripped text starts with "import ". Anchored on the literal
+# "\n" rather than ``^`` + MULTILINE so the scan jumps from newline to newline
+# instead of attempting a match at every character.
+_IMPORT_LINE_RE = re.compile(r"\n[^\S\n]*import .*\S.*")
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
 class LessonContext:
     """Page-level context for the hint system (no per-exercise parsing)."""
 
@@ -332,7 +550,98 @@ class LessonContext:
     content_body: str | None = None
 
 
-async def fetch_lesson_context(lesson_id: str) -> LessonContext:
+def _parse_lesson_context(raw_mdx: str) -> LessonContext:
+    """Build a LessonContext (title, grading_context, truncated body) from raw MDX."""
+    frontmatter = _parse_frontmatter(raw_mdx)
+    title = frontmatter.get("title")
+    grading_context = frontmatter.get("grading_context")
+
+    # Extract content body (after frontmatter and imports, truncated)
+    bounds = _frontmatter_bounds(raw_mdx)
+    content_body = None
+    if bounds is not None:
+        # Skip import lines
+        body = _IMPORT_LINE_RE.sub("", "\n" + raw_mdx[bounds[1] + 3:]).strip()
+        # Truncate to ~4000 chars to fit within LLM context
+        if len(body) > 4000:
+            body = body[:4000] + "\n\n[... lesson content truncated ...]"
+        content_body = body
+
+    return LessonContext(
+        title=title,
+        grading_context=grading_context,
+        content_body=content_body,
+    )
+
+
+async def _fetch_lesson_context_cached(
+    redis,
+    page_id: str,
+    file_path: str,
+    http: httpx.AsyncClient | None = None,
+) -> LessonContext:
+    """Redis-cached, ETag-revalidated variant of ``fetch_lesson_context``.
+
+    Redis errors and undecodable entries (partial hash, or written before a
+    ``LessonContext`` field change) are logged and treated as a cache miss.
+    """
+    key = f"{LESSON_CACHE_PREFIX}:{page_id}"
+
+    try:
+        entry = await redis.hgetall(key)
+    except Exception as exc:
+        logger.warning("lesson_cache_read_failed", page_id=page_id, error=str(exc))
+        entry = {}
+
+    cached = None
+    if entry:
+        try:
+            cached = LessonContext(**orjson.loads(entry["context"]))
+            fetched_at = float(entry["fetched_at"])
+        except (KeyError, TypeError, ValueError) as exc:
+            # Drop the ETag too — a 304 would leave nothing to serve.
+            logger.warning("lesson_cache_decode_failed", page_id=page_id, error=str(exc))
+            cached = None
+            entry = {}
+
+    if cached and time.time() < fetched_at + LESSON_CACHE_FRESH_TTL:
+        logger.debug("lesson_cache_hit", page_id=page_id)
+        return cached
+
+    try:
+        response = await _github_get(file_path, etag=entry.get("etag"), http=http)
+    except ExerciseFetchError:
+        if cached is None:
+            raise
+        logger.warning("lesson_cache_serving_stale", page_id=page_id)
+        return cached
+
+    mapping: dict[str, bytes | str | float] = {"fetched_at": time.time()}
+    if response.status_code == 304 and cached is not None:
+        logger.debug("lesson_cache_revalidated", page_id=page_id)
+        context = cached
+    else:
+        context = _parse_lesson_context(response.text)
+        mapping["context"] = orjson.dumps(context)  # dataclasses serialize natively
+        mapping["etag"] = response.headers.get("ETag", "")
+        logger.info("lesson_context_fetched", page_id=page_id)
+
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, LESSON_CACHE_MAX_AGE)
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("lesson_cache_write_failed", page_id=page_id, error=str(exc))
+
+    return context
+
+
+async def fetch_lesson_context(
+    lesson_id: str,
+    redis=None,
+    http: httpx.AsyncClient | None = None,
+) -> LessonContext:
     """Fetch page-level lesson context for the hint system.
 
     Unlike fetch_exercise_content(), this extracts the full page context
@@ -342,6 +651,9 @@ async def fetch_lesson_context(lesson_id: str) -> LessonContext:
     Args:
         lesson_id: The lesson page ID (e.g., "prml/1-exercise").
             If it contains '#', the exercise part is stripped.
+        redis: Optional async Redis client. When given, the parsed context is
+            cached in Redis and revalidated against GitHub with its ETag.
+        http: Optional shared HTTP client (see app/services/http_client.py).
 
     Returns:
         LessonContext with page-level metadata.
@@ -355,31 +667,8 @@ async def fetch_lesson_context(lesson_id: str) -> LessonContext:
 
     logger.info("fetching_lesson_context", lesson_id=lesson_id, file_path=file_path)
 
-    raw_mdx = await _fetch_file_from_github(file_path)
-
-    title = _extract_frontmatter_field(raw_mdx, "title")
-    grading_context = _extract_frontmatter_field(raw_mdx, "grading_context")
-
-    # Extract content body (after frontmatter and imports, truncated)
-    parts = raw_mdx.split("---", 2)
-    content_body = None
-    if len(parts) >= 3:
-        body = parts[2].strip()
-        # Skip import lines
-        lines = body.split("\n")
-        content_lines = [
-            line for line in lines
-            if not line.strip().startswith("import ")
-        ]
-        body = "\n".join(content_lines).strip()
-        # Truncate to ~4000 chars to fit within LLM context
-        if len(body) > 4000:
-            body = body[:4000] + "\n\n[... lesson content truncated ...]"
-        content_body = body
-
-    return LessonContext(
-        title=title,
-        grading_context=grading_context,
-        content_body=content_body,
-    )
+    if redis is not None:
+        return await _fetch_lesson_context_cached(redis, page_id, file_path, http=http)
 
+    raw_mdx = await _fetch_file_from_github(file_path, http=http)
+    return _parse_lesson_context(raw_mdx)
@@ -0,0 +1,100 @@
+"""
+app/services/grading_cache.py
+
+Content-addressed cache of validated LLM grading results (opt-in via
+``GRADING_CACHE_ENABLED``).
+
+A re-enqueued submission, or a resubmission with identical content, grades
+to the same result — this lets the worker skip the LLM call (seconds) for a
+single Redis GET. The key is a SHA-256 over everything the grade depends on:
+the model, the prompt template, the exercise (question, rubric, solution,
+grading_context) and the student's content. Editing any of them misses.
+
+Fields are length-prefixed (8-byte big-endian) before hashing, so no two
+different field tuples can concatenate to the same byte string.
+
+Rules:
+  - Only ``GradingResponse`` JSON is stored, and it is re-validated on read;
+    entries that no longer validate are evicted. Never cache free-form output.
+  - Redis errors are logged and treated as a miss — the cache never fails
+    a grading.
+"""
+
+import hashlib
+
+import orjson
+import redis.asyncio as aioredis
+from pydantic import ValidationError
+
+from app.core.logging import get_logger
+from app.schemas.grading import GradingResponse
+from app.services.grading_prompt import GRADING_PROMPT_TEMPLATE
+
+logger = get_logger(__name__)
+
+GRADING_CACHE_PREFIX = "cs4all:grading_cache"
+GRADING_CACHE_TTL = 86400  # 24 hours
+
+
+def grading_cache_key(
+    *,
+    model_id: str,
+    lesson_id: str,
+    question_text: str,
+    rubric_criteria: list[dict] | None,
+    reference_solution: str | None,
+    grading_context: str | None,
+    user_content: str,
+) -> str:
+    """Build the Redis key for one (model, prompt, exercise, submission) tuple."""
+    digest = hashlib.sha256()
+    for part in (
+        model_id,
+        GRADING_PROMPT_TEMPLATE,
+        lesson_id,
+        question_text,
+        orjson.dumps(rubric_criteria, option=orjson.OPT_SORT_KEYS),
+        reference_solution or "",
+        grading_context or "",
+        user_content,
+    ):
+        data = part if isinstance(part, bytes) else part.encode()
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return f"{GRADING_CACHE_PREFIX}:{digest.hexdigest()}"
+
+
+async def get_cached_grading(redis: aioredis.Redis, key: str) -> GradingResponse | None:
+    """Return the cached grading for ``key``, or None on miss / Redis error."""
+    try:
+        raw = await redis.get(key)
+    except Exception as exc:
+        logger.warning("grading_cache_read_failed", error=str(exc))
+        return None
+
+    if raw is None:
+        return None
+
+    try:
+        return GradingResponse.model_validate_json(raw)
+    except ValidationError as exc:
+        # Written by an older schema — drop it and grade again.
+        logger.warning("grading_cache_entry_invalid", error=str(exc))
+        try:
+            await redis.delete(key)
+        except Exception as del_exc:
+            logger.warning("grading_cache_evict_failed", error=str(del_exc))
+        return None
+
+
+async def set_cached_grading(
+    redis: aioredis.Redis,
+    key: str,
+    response: GradingResponse,
+    ttl: int = GRADING_CACHE_TTL,
+) -> None:
+    """Store a validated grading result under ``key`` for ``ttl`` seconds."""
+    try:
+        await redis.set(key, response.model_dump_json(), ex=ttl)
+    except Exception as exc:
+        logger.warning("grading_cache_write_failed", error=str(exc))
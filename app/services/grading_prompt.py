@@ -7,9 +7,14 @@ Prompt structure:
     CONTEXT  — base role + language + optional frontmatter grading_context
     QUESTION — the exercise question from MDX
     RUBRIC   — grading criteria from <Rubric hidden> component
-    SUBMISSION — the student's submitted solution
     REFERENCE  — the reference solution from <Solution> (for context only)
     INSTRUCTIONS — grading rules and output format
+    SUBMISSION — the student's submitted solution
+
+Everything before SUBMISSION depends only on the exercise, so every
+submission to the same exercise shares that prefix byte-for-byte. Gemini
+(implicit caching) and OpenAI (prompt caching) then bill and prefill it from
+cache. Keep per-submission values at the end of the template.
 
 The grading_context field is optional and comes from the MDX page's
 frontmatter. Content authors use it to provide subject/chapter-specific
@@ -57,14 +62,10 @@ different proof strategies) — award full points if the result is mathematicall
 equivalent and correct, regardless of the specific method used.
 
 {% for criterion in rubric_criteria %}
-- **{{ criterion.points }} point(s)**: {{ criterion.description }}
+- **{{ criterion['points'] }} point(s)**: {{ criterion['description'] }}
 {% endfor %}
 {% endif %}
 
-## Student's Submission
-
-{{ user_submission }}
-
 {% if reference_solution %}
 ## Reference Solution (for your context only — do NOT penalize alternative valid approaches)
 
@@ -82,9 +83,16 @@ equivalent and correct, regardless of the specific method used.
 5. Compute an overall score as a percentage (0–100) based on total points awarded \
    vs total points possible.
 
-Return your evaluation as structured JSON.\
+Return your evaluation as structured JSON.
+
+## Student's Submission
+
+{{ user_submission }}\
 """
 
+# Compiled once at import; render() only runs the generated code. Rubric
+# criteria are plain dicts, so the template subscripts them — ``criterion.points``
+# would make Jinja try (and fail) an attribute lookup before the item lookup.
 _compiled_template = Template(GRADING_PROMPT_TEMPLATE)
 
 
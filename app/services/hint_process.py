@@ -22,7 +22,8 @@ Usage (non-streaming):
 """
 
 import re
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from functools import partial
 
 
 # Matches intended ref patterns the LLM commonly produces, including malformed ones:
@@ -31,8 +32,10 @@ from collections.abc import Iterator
 #   [ref-eq-1]           ← missing colon
 #   ref-eq-1]            ← missing opening bracket (mid-token bleed)
 #   someword[ref:ref-p-1] ← fused with preceding text
+# Every match starts at an optional "[" followed by the literal "ref", so the
+# scan fails fast at each position. A fused preceding word is simply left in
+# place — matching it here (a leading ``\w*``) made long words quadratic.
 _RAW_REF_PATTERN = re.compile(
-    r"(\w*)?"           # optional preceding fused word (bleed)
     r"\[?"              # optional [
     r"ref[-:]"          # ref: or ref-
     r"([\w-]+)"         # the ID body
@@ -44,12 +47,18 @@ _RAW_REF_PATTERN = re.compile(
 _CLEAN_REF_PATTERN = re.compile(r"\[ref:([\w-]+)\]")
 
 # Detects an *incomplete* ref tag at the end of a buffer (for streaming safety)
-# Matches any suffix that looks like the start of a ref tag but isn't closed yet
+# Matches any suffix that looks like the start of a ref tag but isn't closed
+# yet: "[", "[r", "[re", "[ref", "[ref:…" or "[ref-…". Anchored with \Z and
+# free of leading repeats, so a failed attempt costs O(1) per position.
 _INCOMPLETE_REF_SUFFIX = re.compile(
-    r"(\w*\[ref:[\w-]*|\w*\[ref-[\w-]*|\[ref$|\[re$|\[r$|\[$)$",
+    r"\[(?:r(?:e(?:f(?:[-:][\w-]*)?)?)?)?\Z",
     re.IGNORECASE,
 )
 
+# Longest tail held back as a possibly-incomplete ref tag. Only this much of
+# the buffer is searched per chunk, so a long held-back run is never rescanned.
+_MAX_PENDING_REF_LEN = 64
+
 
 def _normalize_ref_id(raw_id: str, valid_ids: set[str]) -> str | None:
     """Try to match a raw extracted ID to a valid anchor ID.
@@ -66,26 +75,26 @@ def _normalize_ref_id(raw_id: str, valid_ids: set[str]) -> str | None:
     return None
 
 
-def _replace_refs(text: str, valid_ids: set[str]) -> str:
+def _ref_replacer(valid_ids: set[str], m: re.Match[str]) -> str:
+    """``re.sub`` callback for ``_RAW_REF_PATTERN`` — bind ``valid_ids`` with partial."""
+    valid_id = _normalize_ref_id(m.group(1), valid_ids)
+
+    # Invented ID — drop the tag entirely
+    return f"[ref:{valid_id}]" if valid_id else ""
+
+
+def _replace_refs(text: str, replacer: Callable[[re.Match[str]], str]) -> str:
     """Replace all ref patterns (well-formed or malformed) in a complete text block.
 
     - Repairs formatting
     - Strips invented IDs (replaces with empty string)
-    - Fixes bleeding (removes fused preceding word characters)
-    """
-    def replacer(m: re.Match) -> str:
-        fused_prefix = m.group(1) or ""
-        raw_id = m.group(2)
-
-        valid_id = _normalize_ref_id(raw_id, valid_ids)
-
-        # Reconstruct: put back any fused word, then the ref tag (or nothing)
-        if valid_id:
-            return f"{fused_prefix}[ref:{valid_id}]"
-        else:
-            # Invented ID — drop the tag entirely, keep any fused word
-            return fused_prefix
+    - Fixes bleeding (any fused preceding word is kept, outside the tag)
 
+    Every match contains "ref", so text without it (most streamed chunks)
+    is returned without running the regex.
+    """
+    if "ref" not in text.lower():
+        return text
     return _RAW_REF_PATTERN.sub(replacer, text)
 
 
@@ -99,8 +108,7 @@ def postprocess_hint(text: str, valid_ids: list[str]) -> str:
     Returns:
         Cleaned string with all ref tags normalized or removed.
     """
-    id_set = set(valid_ids)
-    return _replace_refs(text, id_set)
+    return _replace_refs(text, partial(_ref_replacer, set(valid_ids)))
 
 
 class HintPostProcessor:
@@ -122,7 +130,7 @@ class HintPostProcessor:
     """
 
     def __init__(self, valid_ids: list[str]) -> None:
-        self._valid_ids = set(valid_ids)
+        self._replacer = partial(_ref_replacer, set(valid_ids))
         self._buffer = ""
 
     def feed(self, chunk: str) -> str:
@@ -133,7 +141,8 @@ class HintPostProcessor:
         self._buffer += chunk
 
         # Check if the buffer ends with what looks like an incomplete ref tag
-        m = _INCOMPLETE_REF_SUFFIX.search(self._buffer)
+        tail_start = max(len(self._buffer) - _MAX_PENDING_REF_LEN, 0)
+        m = _INCOMPLETE_REF_SUFFIX.search(self._buffer, tail_start)
         if m:
             # Hold back the suspicious suffix, emit everything before it
             safe_end = m.start()
@@ -143,10 +152,10 @@ class HintPostProcessor:
             safe_text = self._buffer
             self._buffer = ""
 
-        return _replace_refs(safe_text, self._valid_ids) if safe_text else ""
+        return _replace_refs(safe_text, self._replacer) if safe_text else ""
 
     def flush(self) -> str:
         """Flush any remaining buffered text at end of stream."""
         remainder = self._buffer
         self._buffer = ""
-        return _replace_refs(remainder, self._valid_ids) if remainder else ""
\ No newline at end of file
+        return _replace_refs(remainder, self._replacer) if remainder else ""
\ No newline at end of file
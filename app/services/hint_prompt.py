@@ -15,6 +15,7 @@ the same field used for grading but repurposed for teaching.
 from jinja2 import Template
 
 from app.core.logging import get_logger
+from app.schemas.hint import AnchorItem
 
 logger = get_logger(__name__)
 
@@ -82,7 +83,7 @@ def compile_hint_prompt(
     lesson_title: str | None = None,
     grading_context: str | None = None,
     lesson_content: str | None = None,
-    anchor_map: list[dict] | None = None,
+    anchor_map: list[AnchorItem] | None = None,
     language: str = "Vietnamese",
 ) -> str:
     """Compile the hint prompt from the Jinja2 template.
@@ -92,7 +93,7 @@ def compile_hint_prompt(
         lesson_title: The lesson page title.
         grading_context: Subject/chapter context from MDX frontmatter.
         lesson_content: Truncated lesson body (for reference).
-        anchor_map: List of anchor dicts to use for references.
+        anchor_map: Lesson anchors the LLM may reference.
         language: Natural language of the content.
 
     Returns:
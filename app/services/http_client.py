@@ -0,0 +1,49 @@
+"""
+app/services/http_client.py
+
+Shared async HTTP connection pool — lifecycle managed by FastAPI's lifespan.
+
+Outbound calls (GitHub Contents API, …) reuse one ``httpx.AsyncClient`` so
+keep-alive connections and TLS sessions survive across requests instead of
+being re-established per call. The client is stored on ``app.state.http``.
+
+Usage:
+    from fastapi import Depends
+    from app.services.http_client import get_http_client
+    import httpx
+
+    @router.get("/example")
+    async def example(http: httpx.AsyncClient = Depends(get_http_client)):
+        await http.get("https://api.github.com/...")
+"""
+
+import httpx
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Pool sizing for all outbound HTTP traffic from one process.
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = 10.0  # seconds — callers may override per request
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Create the shared async HTTP client (HTTP/2, pooled).
+
+    Called once during application startup (lifespan) or worker startup.
+    """
+    client = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    logger.info("http_client_ready", http2=True, max_connections=HTTP_LIMITS.max_connections)
+    return client
+
+
+async def close_http_client(client: httpx.AsyncClient) -> None:
+    """Close the shared HTTP client and its pooled connections at shutdown."""
+    await client.aclose()
+    logger.info("http_client_closed")
+
+
+def get_http_client(request) -> httpx.AsyncClient:  # type: ignore[type-arg]
+    """FastAPI dependency that retrieves the shared HTTP client from app state."""
+    return request.app.state.http
@@ -2,10 +2,18 @@
 app/services/llm.py
 
 Langchain LLM integration for:
-  - Automated exercise grading (structured output → GradingResponse)
+  - Automated exercise grading (JSON-schema-constrained output → GradingResponse)
   - Socratic hints (streaming free-form markdown)
 
-Initializes a chat model based on available API keys (Gemini → OpenAI).
+Builds one chat model per (provider, model) based on available API keys
+(Gemini → OpenAI) on first use and reuses it for every call.
+
+Grading constrains decoding at the provider level: the GradingResponse JSON
+schema is sent as Gemini's ``response_schema`` / OpenAI's strict
+``json_schema`` response format, and the reply is validated directly by
+GradingResponse's pydantic-core validator. If it still fails validation, the
+validation error is sent back as a follow-up message once so the model can
+correct itself.
 
 Rules (from AGENTS.md Section 3.3):
     - Always validate LLM response against GradingResponse before DB write.
@@ -14,9 +22,20 @@ Rules (from AGENTS.md Section 3.3):
     - LLM API key comes from environment — never hardcode.
 """
 
-from app.core.config import get_settings
+import asyncio
+import contextlib
+import random
+from typing import Any
+
+import httpx
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from pydantic import ValidationError
+
+from app.core.config import Settings, get_settings
 from app.core.logging import get_logger
 from app.schemas.grading import GradingResponse
+from app.schemas.hint import AnchorItem
 from app.services.grading_prompt import compile_grading_prompt
 from app.services.hint_process import HintPostProcessor
 
@@ -29,44 +48,243 @@ class GradingError(Exception):
     pass
 
 
-def _create_llm():
-    """Create a Langchain chat model based on available API keys.
+# Provider HTTP statuses worth retrying: request timeout, rate limit, 5xx, and
+# 529 (provider overloaded).
+_RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504, 529})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Classify a grading failure as transient (retry) or permanent.
+
+    Schema/validation failures are permanent — the same prompt will fail the
+    same way. Timeouts, connection errors and retryable HTTP statuses are
+    transient. SDK errors usually wrap the underlying httpx / provider error,
+    so the ``__cause__`` chain is checked as well.
+    """
+    while exc is not None:
+        if isinstance(exc, (OutputParserException, ValidationError)):
+            return False
+        if isinstance(exc, (httpx.TimeoutException, httpx.TransportError, TimeoutError, ConnectionError)):
+            return True
+        # OpenAI SDK errors carry ``status_code``; Google API errors carry ``code``.
+        for attr in ("status_code", "code"):
+            status_code = getattr(exc, attr, None)
+            if isinstance(status_code, int):
+                return status_code in _RETRYABLE_STATUS_CODES
+        exc = exc.__cause__
+    return False
+
+
+# Follow-up turns allowed per attempt when the reply fails GradingResponse validation.
+_SCHEMA_REPAIR_ATTEMPTS = 1
+
+_SCHEMA_REPAIR_PROMPT = (
+    "Your previous response did not match the required JSON schema:\n\n"
+    "{error}\n\n"
+    "Reply again with only the corrected JSON object."
+)
+
+
+def _backoff_delay(attempt: int, settings: Settings) -> float:
+    """Seconds to wait before retry number ``attempt + 1`` (exponential, jittered, capped)."""
+    delay = settings.llm_base_delay * 2**attempt * (1 + random.uniform(0, settings.llm_jitter))
+    return min(delay, settings.llm_max_delay)
+
+
+def _llm_choice(settings: Settings) -> tuple[str, str]:
+    """Pick ``(provider, model_name)`` from the configured API keys.
 
     Priority: Gemini → OpenAI.
-    Returns a chat model instance configured with the appropriate API key.
 
     Raises:
         GradingError: If no API key is configured.
     """
-    settings = get_settings()
-
     if settings.gemini_api_key:
+        return "google", settings.llm_model or "gemini-2.5-flash"
+    if settings.openai_api_key:
+        return "openai", settings.llm_model or "gpt-4o-mini"
+    raise GradingError(
+        "No LLM API key configured. Set GEMINI_API_KEY or OPENAI_API_KEY in .env"
+    )
+
+
+def llm_model_id() -> str:
+    """Identify the configured model as ``"provider:model"`` (e.g. for cache keys).
+
+    Raises:
+        GradingError: If no API key is configured.
+    """
+    provider, model_name = _llm_choice(get_settings())
+    return f"{provider}:{model_name}"
+
+
+def _create_llm(
+    provider: str,
+    model_name: str,
+    settings: Settings,
+    http: httpx.AsyncClient | None = None,
+):
+    """Create a Langchain chat model for the given provider and model.
+
+    ``http`` (the process's shared pool, see app/services/http_client.py) is
+    handed to the OpenAI SDK so LLM calls reuse its keep-alive HTTP/2
+    connections. The OpenAI SDK sets its own per-request timeout, so the
+    pool's short default does not apply. The Gemini SDK keeps its own pooled
+    client, which is reused for as long as the model is cached.
+    """
+    logger.info("llm_init", provider=provider, model=model_name)
+
+    if provider == "google":
         from langchain_google_genai import ChatGoogleGenerativeAI
 
-        model_name = settings.llm_model or "gemini-2.5-flash"
-        logger.info("llm_init", provider="google", model=model_name)
         return ChatGoogleGenerativeAI(
             model=model_name,
             google_api_key=settings.gemini_api_key,
             temperature=0.1,  # Low temperature for consistent grading
         )
 
-    if settings.openai_api_key:
-        from langchain_openai import ChatOpenAI
+    from langchain_openai import ChatOpenAI
 
-        model_name = settings.llm_model or "gpt-4o-mini"
-        logger.info("llm_init", provider="openai", model=model_name)
-        return ChatOpenAI(
-            model=model_name,
-            api_key=settings.openai_api_key,
-            temperature=0.1,
-        )
+    return ChatOpenAI(
+        model=model_name,
+        api_key=settings.openai_api_key,
+        temperature=0.1,
+        http_async_client=http,
+    )
 
-    raise GradingError(
-        "No LLM API key configured. Set GEMINI_API_KEY or OPENAI_API_KEY in .env"
+
+def _inline_refs(schema: dict) -> dict:
+    """Resolve ``$ref``s into ``$defs`` in place — Gemini's response_schema has no refs."""
+    defs = schema.get("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {k: resolve(v) for k, v in node.items() if k != "$defs"}
+        if isinstance(node, list):
+            return [resolve(v) for v in node]
+        return node
+
+    return resolve(schema)
+
+
+# Both are pure functions of the schema class — built once at import, not per call.
+GRADING_JSON_SCHEMA = GradingResponse.model_json_schema()
+_GEMINI_GRADING_SCHEMA = _inline_refs(GRADING_JSON_SCHEMA)
+
+# pydantic-core validator, looked up once instead of through the model class per reply.
+_validate_grading_json = GradingResponse.__pydantic_validator__.validate_json
+
+
+def _grading_output_kwargs(provider: str) -> dict:
+    """Provider request options that constrain decoding to ``GradingResponse``."""
+    if provider == "google":
+        return {
+            "response_mime_type": "application/json",
+            "response_schema": _GEMINI_GRADING_SCHEMA,
+        }
+    return {
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "GradingResponse",
+                "schema": GRADING_JSON_SCHEMA,
+                "strict": True,
+            },
+        }
+    }
+
+
+# Chat models (and their schema-constrained grading bindings) keyed by
+# (provider, model). Built lazily on first use — never at import — and then
+# reused, so the SDK client and its HTTP connection pool survive across
+# submissions and hints.
+_llm_cache: dict[tuple[str, str], Any] = {}
+_grading_llm_cache: dict[tuple[str, str], Any] = {}
+
+
+def _get_llm(http: httpx.AsyncClient | None = None):
+    """Return the shared chat model for the configured provider.
+
+    The model is built on first use with that caller's ``http`` client.
+
+    Raises:
+        GradingError: If no API key is configured.
+    """
+    settings = get_settings()
+    key = _llm_choice(settings)
+    llm = _llm_cache.get(key)
+    if llm is None:
+        llm = _llm_cache[key] = _create_llm(*key, settings, http)
+    return llm
+
+
+def _get_grading_llm(http: httpx.AsyncClient | None = None):
+    """Return the shared chat model bound to emit ``GradingResponse`` JSON.
+
+    The binding only adds request options, so grading and hints still share
+    one underlying client; hints use the unbound model from ``_get_llm``.
+    """
+    key = _llm_choice(get_settings())
+    grading_llm = _grading_llm_cache.get(key)
+    if grading_llm is None:
+        grading_llm = _get_llm(http).bind(**_grading_output_kwargs(key[0]))
+        _grading_llm_cache[key] = grading_llm
+    return grading_llm
+
+
+def reset_llm_cache() -> None:
+    """Drop the cached chat models.
+
+    Call it whenever the HTTP client they were built with is closed (app and
+    worker shutdown), in tests, or after changing LLM settings.
+    """
+    _llm_cache.clear()
+    _grading_llm_cache.clear()
+
+
+def _message_text(message: BaseMessage) -> str:
+    """Concatenate the text parts of a chat model reply (or streamed chunk).
+
+    Plain-string content — nearly every streamed chunk — returns after one
+    type check; only list-of-parts content (e.g. Gemini) pays for the join.
+    """
+    content = message.content
+    if type(content) is str:
+        return content
+    return "".join(
+        part if isinstance(part, str) else str(part.get("text", "")) for part in content
     )
 
 
+async def _invoke_grading(llm, prompt: str) -> GradingResponse:
+    """Call the grading model and validate its JSON reply.
+
+    A reply that fails validation is answered with the validation error as a
+    follow-up message, up to ``_SCHEMA_REPAIR_ATTEMPTS`` times.
+
+    Raises:
+        ValidationError: If the last reply still does not validate.
+    """
+    messages: list[BaseMessage] = [HumanMessage(prompt)]
+    for repair in range(_SCHEMA_REPAIR_ATTEMPTS + 1):
+        raw = _message_text(await llm.ainvoke(messages))
+        try:
+            return _validate_grading_json(raw)
+        except ValidationError as exc:
+            # Log the raw output for debugging — it is never written to the DB.
+            logger.warning(
+                "llm_grading_invalid_output",
+                repair=repair,
+                raw_output=raw,
+                error=str(exc),
+            )
+            if repair == _SCHEMA_REPAIR_ATTEMPTS:
+                raise
+            messages += [AIMessage(raw), HumanMessage(_SCHEMA_REPAIR_PROMPT.format(error=exc))]
+
+
 async def grade_submission(
     *,
     question_text: str,
@@ -75,13 +293,16 @@ async def grade_submission(
     user_content: str,
     language: str = "Vietnamese",
     grading_context: str | None = None,
-    max_retries: int = 1,
+    max_retries: int | None = None,
+    http: httpx.AsyncClient | None = None,
 ) -> GradingResponse:
     """Grade a student's exercise submission using LLM.
 
     Compiles the grading prompt via Jinja2 template, calls the LLM with
-    structured output enforcement, validates the response, and returns
-    a GradingResponse.
+    schema-constrained JSON output, validates the response, and returns
+    a GradingResponse. Transient provider failures (see ``_is_retryable``)
+    are retried with exponential backoff and jitter; anything else fails
+    on the first attempt.
 
     Args:
         question_text: The exercise question text.
@@ -89,7 +310,9 @@ async def grade_submission(
         reference_solution: The reference solution text (optional).
         user_content: The student's submitted solution.
         language: The natural language of the exercise (default: Vietnamese).
-        max_retries: Number of retries on transient failures.
+        max_retries: Number of retries on transient failures
+            (default: ``settings.llm_max_retries``).
+        http: Optional shared HTTP client (see app/services/http_client.py).
 
     Returns:
         A validated GradingResponse instance.
@@ -107,9 +330,12 @@ async def grade_submission(
         grading_context=grading_context,
     )
 
-    # Create LLM with structured output
-    llm = _create_llm()
-    structured_llm = llm.with_structured_output(GradingResponse)
+    settings = get_settings()
+    if max_retries is None:
+        max_retries = settings.llm_max_retries
+
+    # Shared LLM bound to the GradingResponse JSON schema
+    grading_llm = _get_grading_llm(http)
 
     last_error = None
     for attempt in range(max_retries + 1):
@@ -120,12 +346,7 @@ async def grade_submission(
                 prompt_length=len(prompt),
             )
 
-            result = await structured_llm.ainvoke(prompt)
-
-            if not isinstance(result, GradingResponse):
-                raise GradingError(
-                    f"LLM returned unexpected type: {type(result).__name__}"
-                )
+            result = await _invoke_grading(grading_llm, prompt)
 
             logger.info(
                 "llm_grading_success",
@@ -139,59 +360,123 @@ async def grade_submission(
             raise
         except Exception as exc:
             last_error = exc
+            retryable = _is_retryable(exc)
             logger.warning(
                 "llm_grading_attempt_failed",
                 attempt=attempt + 1,
                 max_retries=max_retries,
+                retryable=retryable,
                 error=str(exc),
                 error_type=type(exc).__name__,
             )
 
-            if attempt < max_retries:
-                logger.info("llm_grading_retrying", next_attempt=attempt + 2)
-                continue
+            if not retryable or attempt == max_retries:
+                break
+
+            delay = _backoff_delay(attempt, settings)
+            logger.info(
+                "llm_grading_retrying",
+                next_attempt=attempt + 2,
+                retry_after_s=round(delay, 2),
+            )
+            await asyncio.sleep(delay)
 
-    # All retries exhausted
+    # Retries exhausted, or a permanent (non-retryable) error
     logger.error(
         "llm_grading_failed_permanently",
+        attempts=attempt + 1,
         error=str(last_error),
         error_type=type(last_error).__name__ if last_error else "unknown",
     )
     raise GradingError(
-        f"LLM grading failed after {max_retries + 1} attempts: {last_error}"
+        f"LLM grading failed after {attempt + 1} attempt(s): {last_error}"
     ) from last_error
 
 
-async def stream_hint(prompt: str, anchor_map: list[dict] | None = None):
+# Hint output is coalesced into SSE frames of at least this many characters...
+HINT_FLUSH_CHARS = 32
+# ...or whatever has accumulated once this many seconds passed since the last
+# frame, even if the model stalls and no further token arrives.
+HINT_FLUSH_INTERVAL = 0.025
+
+
+async def stream_hint(
+    prompt: str,
+    anchor_map: list[AnchorItem] | None = None,
+    http: httpx.AsyncClient | None = None,
+):
     """Stream a free-form hint response from the LLM with post-processing
 
     Used by the hint API endpoint for token-by-token SSE streaming.
     Unlike grade_submission(), this does NOT enforce structured output —
     the response is free-form markdown with optional [ref:"..."] markers.
+
+    Post-processed output is coalesced into batches (see ``HINT_FLUSH_CHARS``
+    / ``HINT_FLUSH_INTERVAL``) so fast token bursts cost one SSE frame rather
+    than one per token. The first output is yielded immediately to keep
+    time-to-first-token unchanged, and buffered output is flushed on a timer
+    so a stalled model never holds it back longer than the interval.
     """
-    llm = _create_llm()
+    llm = _get_llm(http)
     logger.info("hint_stream_start", prompt_length=len(prompt))
 
-    valid_ids = [a["id"] for a in anchor_map] if anchor_map else []
+    valid_ids = [a.id for a in anchor_map] if anchor_map else []
     processor = HintPostProcessor(valid_ids=valid_ids)
 
-    async for chunk in llm.astream(prompt):
-        if hasattr(chunk, "content"):
-            if isinstance(chunk.content, list):
-                token = "".join(str(c.get("text", "")) if isinstance(c, dict) else str(c) for c in chunk.content)
-            else:
-                token = str(chunk.content)
-        else:
-            token = str(chunk)
-            
-        if token:
-            output = processor.feed(token)
-            if output:
-                yield output
+    loop = asyncio.get_running_loop()
+    buf: list[str] = []
+    buf_len = 0
+    last_flush: float | None = None  # None until the first output is sent
+
+    # The next chunk is awaited as a task so the flush timer can fire without
+    # cancelling (and thereby closing) the model stream.
+    chunks = aiter(llm.astream(prompt))
+    next_chunk = asyncio.ensure_future(anext(chunks))
+    try:
+        while True:
+            if buf:
+                timeout = max(last_flush + HINT_FLUSH_INTERVAL - loop.time(), 0.0)
+                done, _pending = await asyncio.wait({next_chunk}, timeout=timeout)
+                if not done:
+                    yield "".join(buf)
+                    buf.clear()
+                    buf_len = 0
+                    last_flush = loop.time()
+                    continue
+            try:
+                chunk = await next_chunk
+            except StopAsyncIteration:
+                break
+            next_chunk = asyncio.ensure_future(anext(chunks))
+
+            token = _message_text(chunk)
+            if token:
+                output = processor.feed(token)
+                if output:
+                    buf.append(output)
+                    buf_len += len(output)
+                    now = loop.time()
+                    if (
+                        last_flush is None
+                        or buf_len >= HINT_FLUSH_CHARS
+                        or now - last_flush >= HINT_FLUSH_INTERVAL
+                    ):
+                        yield "".join(buf)
+                        buf.clear()
+                        buf_len = 0
+                        last_flush = now
+    finally:
+        if not next_chunk.done():
+            next_chunk.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await next_chunk
+        await chunks.aclose()
 
     # Always flush — catches any ref tag sitting in the buffer at stream end
     remainder = processor.flush()
     if remainder:
-        yield remainder
+        buf.append(remainder)
+    if buf:
+        yield "".join(buf)
 
     logger.info("hint_stream_complete")
\ No newline at end of file
@@ -17,6 +17,8 @@ Usage:
         await redis.lpush("some_queue", "value")
 """
 
+import asyncio
+
 import redis.asyncio as aioredis
 
 from app.core.config import get_settings
@@ -45,8 +47,11 @@ async def init_redis() -> aioredis.Redis:
     client: aioredis.Redis = aioredis.from_url(
         redis_url,
         decode_responses=True,
-        # Health-check interval keeps the pool from going stale on long idle periods.
-        health_check_interval=30,
+        # redis-py PINGs a pooled connection before handing it out once it has
+        # been idle this long. Kept well above request inter-arrival times so
+        # hot paths never pay a PING per command; ``watch_redis`` catches dead
+        # connections in the background instead.
+        health_check_interval=settings.redis_health_check_interval,
     )
 
     try:
@@ -67,6 +72,25 @@ async def close_redis(client: aioredis.Redis) -> None:
     logger.info("redis_closed")
 
 
+async def watch_redis(client: aioredis.Redis, interval: float) -> None:
+    """PING Redis every ``interval`` seconds; drop idle connections on failure.
+
+    Runs as a background task for the lifetime of the app (see
+    ``app.main.lifespan``). Replaces per-borrow health checks: when a PING
+    fails, idle pooled connections are disconnected so the next request
+    reconnects instead of failing on a stale socket.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await client.ping()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("redis_ping_failed", error=str(exc))
+            await client.connection_pool.disconnect(inuse_connections=False)
+
+
 def get_redis(request) -> aioredis.Redis:  # type: ignore[type-arg]
     """FastAPI dependency that retrieves the Redis client from app state.
 
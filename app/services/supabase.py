@@ -19,13 +19,22 @@ Usage:
     from app.services.supabase import get_supabase
 """
 
+import asyncio
+
+import httpx
 from supabase import Client, create_client
+from supabase.lib.client_options import SyncClientOptions
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# One pooled HTTP/2 connection set shared by PostgREST, Auth, Storage and
+# Functions. supabase-py's Client is synchronous, so this is an httpx.Client.
+SUPABASE_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+SUPABASE_HTTP_TIMEOUT = 30.0  # seconds
+
 
 async def init_supabase() -> Client:
     """Create and validate the Supabase client.
@@ -44,9 +53,15 @@ async def init_supabase() -> Client:
 
     logger.info("supabase_init_start", url=settings.supabase_url)
 
+    http_client = httpx.Client(
+        http2=True,
+        limits=SUPABASE_HTTP_LIMITS,
+        timeout=SUPABASE_HTTP_TIMEOUT,
+    )
     client: Client = create_client(
         supabase_url=settings.supabase_url,
         supabase_key=settings.supabase_service_role_key,
+        options=SyncClientOptions(httpx_client=http_client),
     )
 
     # Connectivity probe: attempt a minimal SELECT against a system view.
@@ -71,6 +86,26 @@ async def init_supabase() -> Client:
     return client
 
 
+async def execute_async(query):
+    """Run a supabase-py request builder's blocking ``.execute()`` in a worker thread.
+
+    supabase-py's Client is synchronous; calling ``.execute()`` directly inside
+    an ``async def`` stalls the event loop (and every concurrent request, SSE
+    stream, and health ping) for the whole HTTPS round-trip.
+
+    Usage:
+        result = await execute_async(supabase.table("profiles").select("id"))
+    """
+    return await asyncio.to_thread(query.execute)
+
+
+def close_supabase(client: Client) -> None:
+    """Close the Supabase client's pooled HTTP connections at shutdown."""
+    if client.options.httpx_client is not None:
+        client.options.httpx_client.close()
+    logger.info("supabase_closed")
+
+
 def get_supabase(request) -> Client:  # type: ignore[type-arg]
     """FastAPI dependency that retrieves the Supabase client from app state.
 
@@ -4,13 +4,27 @@ app/workers/grading_worker.py
 Standalone async worker process that consumes from the Redis grading queue.
 
 Phase 3.5 behaviour:
-  - BRPOP from ``cs4all:grading_queue`` (blocks until an item arrives)
+  - XREADGROUP a batch from the ``cs4all:grading_stream`` consumer group
+    (blocks until entries arrive); idle pending entries left by a crashed
+    worker are reclaimed with XAUTOCLAIM whenever the stream is quiet and at
+    least every ``CLAIM_INTERVAL_S`` seconds under load
+  - Grade up to ``GRADING_WORKER_CONCURRENCY`` submissions concurrently
+  - Prefetch the batch's exercise files from GitHub concurrently
   - Fetch the submission from ``exercise_submissions`` via Service Role Key
   - Validate the row exists and status == 'submitted'
   - Fetch exercise content (question, rubric, reference solution) from GitHub
-  - Call LLM via Langchain with structured output (GradingResponse)
+  - Call LLM via Langchain with structured output (GradingResponse), unless
+    an identical submission's grading is cached (GRADING_CACHE_ENABLED)
   - On success: UPDATE llm_score, llm_feedback, status='ai_graded'
   - On failure: log error, set status='grading_failed' if permanent
+    (both writes are batched across concurrent gradings — see write_buffer.py)
+  - XACK the entry once its outcome is final (graded, marked failed, or
+    skipped); entries finishing together share one XACK round-trip. A
+    transient failure leaves the entry pending so XAUTOCLAIM retries it, up
+    to ``MAX_DELIVERIES`` deliveries before the row is marked grading_failed
+  - On SIGTERM/SIGINT: stop reading, let in-flight gradings finish for up to
+    ``GRADING_WORKER_SHUTDOWN_GRACE`` seconds, then cancel the rest (their
+    entries stay pending and are reclaimed by the next worker)
 
 Run as:
     uv run python -m app.workers.grading_worker
@@ -19,23 +33,67 @@ See cs4all-backend/AGENTS.md Section 3.2 for the full responsibility chain.
 """
 
 import asyncio
+import contextlib
+import os
+import signal
+import socket
 import sys
 
 from app.core.config import get_settings
-from app.core.logging import get_logger, setup_logging
+from app.core.logging import flush_logs, get_logger, setup_logging
+from app.services.github import (
+    ExerciseFetchError,
+    fetch_exercise_content,
+    prefetch_exercise_files,
+)
+from app.services.grading_cache import (
+    get_cached_grading,
+    grading_cache_key,
+    set_cached_grading,
+)
+from app.services.http_client import close_http_client, init_http_client
+from app.services.llm import (
+    GradingError,
+    grade_submission,
+    llm_model_id,
+    reset_llm_cache,
+)
 from app.services.redis_client import close_redis, init_redis
-from app.services.supabase import init_supabase
+from app.services.supabase import close_supabase, execute_async, init_supabase
+from app.workers.write_buffer import WriteBuffer
 
 logger = get_logger(__name__)
 
 # Must match the key used by POST /api/v1/grade (app/api/v1/grade.py)
-GRADING_QUEUE_KEY = "cs4all:grading_queue"
+GRADING_STREAM_KEY = "cs4all:grading_stream"
+GRADING_GROUP = "graders"
 
-# How long BRPOP blocks before checking for shutdown signals (seconds)
-BRPOP_TIMEOUT = 5
+# Max entries fetched per XREADGROUP / XAUTOCLAIM round-trip
+BATCH_SIZE = 16
 
+# How long XREADGROUP blocks before checking for shutdown signals (ms)
+READ_BLOCK_MS = 5000
 
-async def process_submission(supabase, submission_id: str) -> None:
+# Pending entries idle this long belong to a dead worker (or failed
+# transiently) and are reclaimed (ms)
+CLAIM_MIN_IDLE_MS = 10 * 60 * 1000
+
+# Longest gap between XAUTOCLAIM passes, even while new entries keep
+# arriving — otherwise a busy stream would never reclaim anything (s)
+CLAIM_INTERVAL_S = CLAIM_MIN_IDLE_MS / 1000 / 10
+
+# Deliveries after which a still-unfinished entry is marked grading_failed
+MAX_DELIVERIES = 5
+
+
+async def process_submission(
+    supabase,
+    submission_id: str,
+    *,
+    write_buffer: WriteBuffer,
+    http=None,
+    redis=None,
+) -> bool:
     """Fetch and process a single submission from the database.
 
     Phase 3.5 pipeline:
@@ -43,7 +101,8 @@ async def process_submission(supabase, submission_id: str) -> None:
       2. Validate status == 'submitted'
       3. Fetch exercise content (question, rubric, solution) from GitHub
       4. Call LLM grader with structured output
-      5. Write llm_score, llm_feedback, status='ai_graded' to DB
+      5. Write llm_score, llm_feedback, status='ai_graded' to DB (batched
+         with other finished gradings by ``write_buffer``)
 
     On permanent failure (e.g., malformed LLM output after retries):
       - Set status='grading_failed' and log the error.
@@ -51,30 +110,41 @@ async def process_submission(supabase, submission_id: str) -> None:
     Args:
         supabase: The initialized Supabase client (Service Role Key).
         submission_id: UUID string of the exercise submission.
+        write_buffer: The worker's batched writer for grading results.
+        http: The worker's shared ``httpx.AsyncClient`` for GitHub fetches.
+        redis: The worker's Redis client, for the optional grading cache.
+
+    Returns:
+        True if the outcome is final (graded, marked failed, or nothing to
+        do) and the stream entry may be acked; False after a transient
+        failure (DB/network error, failed write), leaving the row
+        'submitted' so the entry is retried.
     """
     logger.info("processing_submission", submission_id=submission_id)
 
     # ── Fetch the submission row ──────────────────────────────────────────────
+    # maybe_single(): a missing row is a final outcome (None), not an error —
+    # .single() would raise PGRST116 and have the entry retried for nothing.
     try:
-        result = (
+        result = await execute_async(
             supabase.table("exercise_submissions")
             .select("*")
             .eq("id", submission_id)
-            .single()
-            .execute()
+            .maybe_single()
         )
-        submission = result.data
+        # postgrest-py returns None instead of a response when no row matches.
+        submission = result.data if result is not None else None
     except Exception as exc:
         logger.error(
             "submission_fetch_failed",
             submission_id=submission_id,
             error=str(exc),
         )
-        return
+        return False
 
     if not submission:
         logger.warning("submission_not_found", submission_id=submission_id)
-        return
+        return True
 
     # ── Validate status ───────────────────────────────────────────────────────
     current_status = submission.get("status")
@@ -85,7 +155,7 @@ async def process_submission(supabase, submission_id: str) -> None:
             status=current_status,
             reason="Expected 'submitted', skipping to avoid reprocessing",
         )
-        return
+        return True
 
     # ── Phase 3.5: LLM-Assisted Grading ───────────────────────────────────────
     lesson_id = submission.get("lesson_id", "")
@@ -93,9 +163,7 @@ async def process_submission(supabase, submission_id: str) -> None:
 
     try:
         # 1. Fetch exercise content from GitHub (question, rubric, solution)
-        from app.services.github import ExerciseFetchError, fetch_exercise_content
-
-        exercise = await fetch_exercise_content(lesson_id)
+        exercise = await fetch_exercise_content(lesson_id, http=http)
 
         logger.info(
             "exercise_content_fetched",
@@ -105,25 +173,62 @@ async def process_submission(supabase, submission_id: str) -> None:
             has_solution=bool(exercise.solution),
         )
 
-        # 2. Call LLM grader
-        from app.services.llm import GradingError, grade_submission
-
-        grading_result = await grade_submission(
-            question_text=exercise.question,
-            rubric_criteria=exercise.rubric_criteria,
-            reference_solution=exercise.solution,
-            user_content=user_content,
-            grading_context=exercise.grading_context,
-        )
+        # 2. Call LLM grader (or reuse the grading of an identical submission)
+        grading_result = None
+        cache_key = None
+        if redis is not None and get_settings().grading_cache_enabled:
+            cache_key = grading_cache_key(
+                model_id=llm_model_id(),
+                lesson_id=lesson_id,
+                question_text=exercise.question,
+                rubric_criteria=exercise.rubric_criteria,
+                reference_solution=exercise.solution,
+                grading_context=exercise.grading_context,
+                user_content=user_content,
+            )
+            grading_result = await get_cached_grading(redis, cache_key)
+            if grading_result is not None:
+                logger.info("grading_cache_hit", submission_id=submission_id)
+
+        if grading_result is None:
+            grading_result = await grade_submission(
+                question_text=exercise.question,
+                rubric_criteria=exercise.rubric_criteria,
+                reference_solution=exercise.solution,
+                user_content=user_content,
+                grading_context=exercise.grading_context,
+                http=http,
+            )
+            if cache_key is not None:
+                await set_cached_grading(redis, cache_key, grading_result)
 
-        # 3. Write results to DB
-        supabase.table("exercise_submissions").update(
-            {
-                "llm_score": grading_result.overall_score,
-                "llm_feedback": [item.model_dump() for item in grading_result.feedback],
-                "status": "ai_graded",
-            }
-        ).eq("id", submission_id).execute()
+        # 3. Write results to DB — one pydantic-core pass serializes the whole
+        # response to JSON-ready primitives (no per-item model_dump loop).
+        try:
+            written = await write_buffer.write(
+                {
+                    "id": submission_id,
+                    "llm_score": grading_result.overall_score,
+                    "llm_feedback": grading_result.model_dump(mode="json")["feedback"],
+                    "status": "ai_graded",
+                }
+            )
+        except Exception as exc:
+            # The batch RPC failed even after its retry — the row is still
+            # 'submitted', so leave the entry pending to be graded again.
+            logger.error(
+                "grading_write_failed",
+                submission_id=submission_id,
+                error=str(exc),
+            )
+            return False
+        if not written:
+            logger.warning(
+                "submission_write_skipped",
+                submission_id=submission_id,
+                reason="Status changed while grading; result discarded",
+            )
+            return True
 
         logger.info(
             "submission_graded",
@@ -132,6 +237,7 @@ async def process_submission(supabase, submission_id: str) -> None:
             feedback_count=len(grading_result.feedback),
             status="ai_graded",
         )
+        return True
 
     except (ExerciseFetchError, GradingError) as exc:
         # Permanent failure — mark as grading_failed
@@ -141,23 +247,11 @@ async def process_submission(supabase, submission_id: str) -> None:
             error=str(exc),
             error_type=type(exc).__name__,
         )
-        try:
-            supabase.table("exercise_submissions").update(
-                {"status": "grading_failed"}
-            ).eq("id", submission_id).execute()
-            logger.info(
-                "submission_marked_failed",
-                submission_id=submission_id,
-            )
-        except Exception as db_exc:
-            logger.error(
-                "failed_to_mark_grading_failed",
-                submission_id=submission_id,
-                error=str(db_exc),
-            )
+        return await _mark_grading_failed(write_buffer, submission_id)
 
     except Exception as exc:
-        # Unexpected error — log but leave as 'submitted' for retry
+        # Unexpected error (including a failed result write) — leave as
+        # 'submitted' and the entry unacked for retry
         logger.error(
             "grading_unexpected_error",
             submission_id=submission_id,
@@ -165,20 +259,242 @@ async def process_submission(supabase, submission_id: str) -> None:
             error_type=type(exc).__name__,
             exc_info=True,
         )
+        return False
+
+
+async def _mark_grading_failed(write_buffer: WriteBuffer, submission_id: str) -> bool:
+    """Set status='grading_failed'; returns False if the write itself failed."""
+    try:
+        await write_buffer.write({"id": submission_id, "status": "grading_failed"})
+    except Exception as db_exc:
+        logger.error(
+            "failed_to_mark_grading_failed",
+            submission_id=submission_id,
+            error=str(db_exc),
+        )
+        return False
+    logger.info("submission_marked_failed", submission_id=submission_id)
+    return True
+
+
+async def _ensure_consumer_group(redis) -> None:
+    """Create the consumer group (and the stream) if they do not exist yet.
+
+    Created at ID ``0`` so entries enqueued before the first worker started
+    are still delivered.
+    """
+    try:
+        await redis.xgroup_create(GRADING_STREAM_KEY, GRADING_GROUP, id="0", mkstream=True)
+        logger.info("consumer_group_created", stream=GRADING_STREAM_KEY, group=GRADING_GROUP)
+    except Exception as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+async def _claim_stale_entries(redis, consumer: str, count: int = BATCH_SIZE) -> list:
+    """Take over pending entries that were never acked.
+
+    Those are entries of a crashed consumer and entries whose processing
+    failed transiently. Returns ``(entry_id, fields, deliveries)`` triples,
+    with the delivery count (including this claim) read back via XPENDING.
+    """
+    _next_id, entries, *rest = await redis.xautoclaim(
+        GRADING_STREAM_KEY,
+        GRADING_GROUP,
+        consumer,
+        min_idle_time=CLAIM_MIN_IDLE_MS,
+        start_id="0-0",
+        count=count,
+    )
+    # Redis ≥ 7 also returns the IDs of pending entries that MAXLEN trimmed
+    # away before they were acked; they are dropped from the PEL, so their
+    # submissions will not be redelivered and need a manual re-grade.
+    deleted = rest[0] if rest else []
+    if deleted:
+        logger.error("stale_entries_trimmed", entry_ids=deleted, consumer=consumer)
+    if not entries:
+        return []
+
+    logger.warning("stale_entries_reclaimed", count=len(entries), consumer=consumer)
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for entry_id, _fields in entries:
+            pipe.xpending_range(
+                GRADING_STREAM_KEY, GRADING_GROUP, min=entry_id, max=entry_id, count=1
+            )
+        pending = await pipe.execute()
+
+    return [
+        (entry_id, fields, info[0]["times_delivered"] if info else 1)
+        for (entry_id, fields), info in zip(entries, pending)
+    ]
+
+
+class _AckBatcher:
+    """Coalesces the XACKs issued within one event-loop tick into one command.
+
+    Gradings whose results were written in the same ``record_gradings`` batch
+    wake up in the same tick, so their acknowledgements cost one round-trip
+    instead of one each.
+    """
+
+    def __init__(self, redis) -> None:
+        self._redis = redis
+        self._ids: list[str] = []
+        self._done: asyncio.Future[None] | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def ack(self, entry_id: str) -> None:
+        """XACK ``entry_id`` together with any other entries acked this tick.
+
+        Raises:
+            Exception: Whatever XACK raised, if it failed.
+        """
+        if self._done is None:
+            self._done = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(self._flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        self._ids.append(entry_id)
+        await asyncio.shield(self._done)
+
+    async def _flush(self) -> None:
+        # Let every task already woken this tick add its entry first.
+        await asyncio.sleep(0)
+        ids, done = self._ids, self._done
+        self._ids, self._done = [], None
+        try:
+            await self._redis.xack(GRADING_STREAM_KEY, GRADING_GROUP, *ids)
+        except Exception as exc:
+            done.set_exception(exc)
+        else:
+            done.set_result(None)
+
+
+async def _process_entry(
+    supabase,
+    redis,
+    write_buffer: WriteBuffer,
+    acks: _AckBatcher,
+    entry_id: str,
+    fields: dict,
+    deliveries: int = 1,
+    http=None,
+) -> None:
+    """Process one stream entry, XACKing it once its outcome is final.
+
+    After a transient failure the entry is left pending; XAUTOCLAIM hands it
+    back once it has been idle for ``CLAIM_MIN_IDLE_MS``. Past
+    ``MAX_DELIVERIES`` the submission is marked grading_failed instead of
+    being retried again.
+    """
+    submission_id = str((fields or {}).get("submission_id", ""))
+
+    final = True
+    if submission_id and deliveries > MAX_DELIVERIES:
+        logger.error(
+            "submission_retries_exhausted",
+            submission_id=submission_id,
+            entry_id=entry_id,
+            deliveries=deliveries,
+        )
+        final = await _mark_grading_failed(write_buffer, submission_id)
+    elif submission_id:
+        try:
+            final = await process_submission(
+                supabase,
+                submission_id,
+                write_buffer=write_buffer,
+                http=http,
+                redis=redis,
+            )
+        except Exception as exc:
+            # Catch-all: never let a single bad submission crash the worker.
+            logger.error(
+                "submission_processing_error",
+                submission_id=submission_id,
+                error=str(exc),
+                exc_info=True,
+            )
+            final = False
+
+    if not final:
+        logger.warning(
+            "submission_left_pending",
+            submission_id=submission_id,
+            entry_id=entry_id,
+            deliveries=deliveries,
+        )
+        return
+
+    try:
+        await acks.ack(entry_id)
+    except Exception as exc:
+        # Left pending — XAUTOCLAIM hands it back later, and the status check
+        # in process_submission skips an already-graded submission.
+        logger.error("xack_failed", entry_id=entry_id, error=str(exc))
+
+
+async def _dispatch_entries(
+    supabase,
+    redis,
+    write_buffer: WriteBuffer,
+    acks: _AckBatcher,
+    entries: list,
+    tasks: set[asyncio.Task],
+    http=None,
+) -> None:
+    """Start a task per stream entry, tracked in ``tasks`` until it finishes.
+
+    ``entries`` are ``(entry_id, fields, deliveries)`` triples. The batch's
+    exercise files are fetched from GitHub concurrently up front
+    (``lesson_id`` is carried on each stream entry), so the per-submission
+    fetches are cache hits.
+    """
+    await prefetch_exercise_files(
+        (str((fields or {}).get("lesson_id", "")) for _entry_id, fields, _n in entries),
+        http=http,
+    )
+
+    for entry_id, fields, deliveries in entries:
+        task = asyncio.create_task(
+            _process_entry(
+                supabase,
+                redis,
+                write_buffer,
+                acks,
+                entry_id,
+                fields,
+                deliveries,
+                http=http,
+            )
+        )
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
 
 
 async def run_worker() -> None:
-    """Main worker loop — runs indefinitely, consuming from the grading queue.
+    """Main worker loop — runs indefinitely, consuming from the grading stream.
 
     Initializes its own Supabase and Redis clients (separate from the FastAPI app).
-    Blocks on BRPOP and processes one submission at a time.
+    Up to ``GRADING_WORKER_CONCURRENCY`` submissions are graded at once: the
+    loop only reads (via a consumer group) as many entries as there are free
+    slots, and waits for a slot when all are busy. Grading is bound by LLM
+    latency, so throughput scales with the slot count.
+
+    SIGTERM/SIGINT stop the reads; in-flight gradings (already paid for) get
+    ``GRADING_WORKER_SHUTDOWN_GRACE`` seconds to finish before cancellation.
     """
     settings = get_settings()
     setup_logging(environment=settings.environment)
 
+    concurrency = settings.grading_worker_concurrency
+
     logger.info(
         "worker_starting",
-        queue=GRADING_QUEUE_KEY,
+        stream=GRADING_STREAM_KEY,
+        group=GRADING_GROUP,
+        concurrency=concurrency,
         environment=settings.environment,
     )
 
@@ -187,31 +503,76 @@ async def run_worker() -> None:
     # even though supabase-py's create_client() is synchronous.
     supabase = await init_supabase()
     redis = await init_redis()
+    http = await init_http_client()
+    write_buffer = WriteBuffer(supabase)
+    acks = _AckBatcher(redis)
+
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    tasks: set[asyncio.Task] = set()
 
-    logger.info("worker_ready", message="Listening for submissions...")
+    shutdown = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        # Not supported on Windows — Ctrl+C still raises KeyboardInterrupt there.
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, shutdown.set)
+
+    logger.info("worker_ready", message="Listening for submissions...", consumer=consumer)
 
     try:
+        await _ensure_consumer_group(redis)
+
+        # Pick up anything a previous worker left in flight before reading new work.
+        entries = await _claim_stale_entries(redis, consumer, min(concurrency, BATCH_SIZE))
+        next_claim = loop.time() + CLAIM_INTERVAL_S
+
         while True:
-            # BRPOP blocks until an item is available or timeout elapses.
-            # Returns (key, value) or None on timeout.
-            result = await redis.brpop(GRADING_QUEUE_KEY, timeout=BRPOP_TIMEOUT)
+            free_slots = concurrency - len(tasks)
+
+            if entries:
+                await _dispatch_entries(
+                    supabase, redis, write_buffer, acks, entries, tasks, http=http
+                )
+                entries = []
+                continue
+
+            if shutdown.is_set():
+                logger.info("worker_shutdown_requested", in_flight=len(tasks))
+                break
 
-            if result is None:
-                # Timeout — no items in queue. Loop back and block again.
+            if free_slots <= 0:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
                 continue
 
-            _key, submission_id = result
-            submission_id = str(submission_id)
-
-            try:
-                await process_submission(supabase, submission_id)
-            except Exception as exc:
-                # Catch-all: never let a single bad submission crash the worker.
-                logger.error(
-                    "submission_processing_error",
-                    submission_id=submission_id,
-                    error=str(exc),
-                    exc_info=True,
+            if loop.time() >= next_claim:
+                # Reclaim on a timer too, so sustained inflow (XREADGROUP
+                # never coming back empty) cannot starve abandoned entries.
+                next_claim = loop.time() + CLAIM_INTERVAL_S
+                entries = await _claim_stale_entries(
+                    redis, consumer, min(free_slots, BATCH_SIZE)
+                )
+                if entries:
+                    continue
+
+            # XREADGROUP blocks until entries arrive or READ_BLOCK_MS elapses;
+            # in-flight gradings keep running meanwhile.
+            # Returns [[stream, [(id, fields), ...]]] or [] on timeout.
+            result = await redis.xreadgroup(
+                GRADING_GROUP,
+                consumer,
+                {GRADING_STREAM_KEY: ">"},
+                count=min(free_slots, BATCH_SIZE),
+                block=READ_BLOCK_MS,
+            )
+            new_entries = result[0][1] if result else []
+            # Entries read with ">" are on their first delivery.
+            entries = [(entry_id, fields, 1) for entry_id, fields in new_entries]
+
+            if not entries:
+                # Idle — use the quiet time to reclaim abandoned entries.
+                next_claim = loop.time() + CLAIM_INTERVAL_S
+                entries = await _claim_stale_entries(
+                    redis, consumer, min(free_slots, BATCH_SIZE)
                 )
 
     except KeyboardInterrupt:
@@ -220,9 +581,31 @@ async def run_worker() -> None:
         logger.error("worker_fatal_error", error=str(exc), exc_info=True)
         sys.exit(1)
     finally:
+        if tasks:
+            # Let in-flight gradings finish (and XACK) before the clients close.
+            grace = settings.grading_worker_shutdown_grace
+            logger.info("worker_draining", in_flight=len(tasks), grace_s=grace)
+            _done, unfinished = await asyncio.wait(tasks, timeout=grace)
+            if unfinished:
+                # Unacked entries stay pending; XAUTOCLAIM hands them to the next worker.
+                logger.warning("worker_drain_timeout", cancelled=len(unfinished))
+                for task in unfinished:
+                    task.cancel()
+                await asyncio.gather(*unfinished, return_exceptions=True)
+        await write_buffer.close()
+        reset_llm_cache()  # the cached chat models hold ``http``
+        await close_http_client(http)
+        close_supabase(supabase)
         await close_redis(redis)
         logger.info("worker_stopped")
+        flush_logs()
 
 
 if __name__ == "__main__":
-    asyncio.run(run_worker())
+    try:
+        # libuv-based event loop: cheaper task switches with many gradings in flight.
+        import uvloop
+    except ImportError:  # not installed on Windows
+        asyncio.run(run_worker())
+    else:
+        uvloop.run(run_worker())
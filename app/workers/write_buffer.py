@@ -0,0 +1,130 @@
+"""
+app/workers/write_buffer.py
+
+Batches the grading worker's ``exercise_submissions`` writes.
+
+With several submissions graded concurrently, results that finish close
+together are written with one ``public.record_gradings()`` RPC instead of one
+UPDATE round-trip each. A batch is flushed once it holds ``WRITE_BATCH_MAX``
+rows or ``WRITE_BATCH_MAX_LATENCY`` seconds after its first row arrived.
+
+``write()`` only returns once the batch containing the row is committed, so
+the caller still XACKs a stream entry strictly after its result is in the
+database — a crash never loses a grading that was already acknowledged.
+
+A failed RPC is retried once (the gradings in it were already paid for);
+if it fails again, every ``write()`` in the batch raises and the worker
+leaves those entries pending for redelivery.
+
+See supabase/migrations/20260310000000_create_record_gradings_function.sql
+for the status guard applied by the RPC.
+"""
+
+import asyncio
+
+from supabase import Client
+
+from app.core.logging import get_logger
+from app.services.supabase import execute_async
+
+logger = get_logger(__name__)
+
+# Flush a batch at this many rows...
+WRITE_BATCH_MAX = 32
+# ...or this many seconds after its first row, whichever comes first.
+WRITE_BATCH_MAX_LATENCY = 0.2
+
+# A failed batch RPC is retried once after this many seconds.
+WRITE_RETRY_DELAY = 0.5
+
+
+class WriteBuffer:
+    """Coalesces grading result writes into batched ``record_gradings`` RPCs."""
+
+    def __init__(
+        self,
+        supabase: Client,
+        max_batch: int = WRITE_BATCH_MAX,
+        max_latency: float = WRITE_BATCH_MAX_LATENCY,
+    ) -> None:
+        self._supabase = supabase
+        self._max_batch = max_batch
+        self._max_latency = max_latency
+        self._rows: list[dict] = []
+        self._waiters: list[asyncio.Future[bool]] = []
+        self._timer: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def write(self, row: dict) -> bool:
+        """Queue one row (``id`` + columns to set) and wait until it is written.
+
+        Returns:
+            True if the row was updated, False if the status guard skipped it
+            (the submission is no longer 'submitted').
+
+        Raises:
+            Exception: Whatever the batch's RPC raised, if it failed.
+        """
+        waiter: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._rows.append(row)
+        self._waiters.append(waiter)
+
+        if len(self._rows) >= self._max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_delay())
+
+        return await waiter
+
+    async def close(self) -> None:
+        """Flush anything still buffered and wait for in-flight batches."""
+        if self._rows:
+            self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _start_flush(self) -> None:
+        """Hand the current batch to a background flush task."""
+        if self._timer is not None:
+            # Still sleeping — its rows are being flushed here instead.
+            self._timer.cancel()
+            self._timer = None
+
+        rows, waiters = self._rows, self._waiters
+        self._rows, self._waiters = [], []
+
+        task = asyncio.create_task(self._flush(rows, waiters))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_after_delay(self) -> None:
+        await asyncio.sleep(self._max_latency)
+        # Cleared before flushing so _start_flush never cancels a running RPC.
+        self._timer = None
+        self._start_flush()
+
+    async def _flush(self, rows: list[dict], waiters: list[asyncio.Future[bool]]) -> None:
+        try:
+            result = await self._record(rows)
+        except Exception as exc:
+            logger.warning("grading_write_batch_retrying", rows=len(rows), error=str(exc))
+            await asyncio.sleep(WRITE_RETRY_DELAY)
+            try:
+                # Safe to repeat: the status guard skips rows the first call
+                # may already have committed.
+                result = await self._record(rows)
+            except Exception as exc:
+                logger.error("grading_write_batch_failed", rows=len(rows), error=str(exc))
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                return
+
+        updated = {str(row_id) for row_id in (result.data or [])}
+        logger.debug("grading_write_batch", rows=len(rows), updated=len(updated))
+        for row, waiter in zip(rows, waiters):
+            if not waiter.done():
+                waiter.set_result(row["id"] in updated)
+
+    async def _record(self, rows: list[dict]):
+        return await execute_async(self._supabase.rpc("record_gradings", {"p_rows": rows}))
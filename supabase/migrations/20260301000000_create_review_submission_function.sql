@@ -0,0 +1,60 @@
+-- Migration: Create public.review_submission() for the admin review endpoint
+-- Phase 3 — collapses "SELECT status, then UPDATE" into one conditional UPDATE
+-- Called by: POST /api/v1/admin/submissions/{id}/review via supabase.rpc()
+--
+-- Status guard (docs/AGENTS.md Section 4.5): only 'submitted' or 'ai_graded'
+-- may transition to 'human_reviewed'. The check and the write happen in the
+-- same statement, so two concurrent reviews cannot both succeed.
+--
+-- Error codes (mapped to HTTP statuses by app/api/v1/admin.py):
+--   P0002  submission not found           → 404
+--   CS409  submission already reviewed    → 409
+--   CS422  submission in another status   → 422
+
+create or replace function public.review_submission(
+  p_submission_id uuid,
+  p_reviewer_score integer
+)
+returns public.exercise_submissions
+language plpgsql
+as $$
+declare
+  v_row public.exercise_submissions;
+  v_status text;
+begin
+  update public.exercise_submissions
+     set reviewer_score = p_reviewer_score,
+         status = 'human_reviewed',
+         reviewed_at = timezone('utc'::text, now())
+   where id = p_submission_id
+     and status in ('submitted', 'ai_graded')
+  returning * into v_row;
+
+  if found then
+    return v_row;
+  end if;
+
+  -- Slow path: explain why nothing was updated.
+  select status into v_status
+    from public.exercise_submissions
+   where id = p_submission_id;
+
+  if not found then
+    raise exception 'Submission % not found', p_submission_id
+      using errcode = 'P0002';
+  end if;
+
+  if v_status = 'human_reviewed' then
+    raise exception 'Submission has already been reviewed'
+      using errcode = 'CS409';
+  end if;
+
+  raise exception 'Cannot review submission with status ''%''', v_status
+    using errcode = 'CS422';
+end;
+$$;
+
+-- Only the backend (Service Role Key) may call this. Users must never be able
+-- to review submissions through the PostgREST RPC endpoint.
+revoke execute on function public.review_submission(uuid, integer) from public, anon, authenticated;
+grant execute on function public.review_submission(uuid, integer) to service_role;
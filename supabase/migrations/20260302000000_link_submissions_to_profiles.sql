@@ -0,0 +1,10 @@
+-- Migration: Link exercise_submissions.user_id to public.profiles
+-- Phase 3 — lets the admin list embed submitter profiles in one PostgREST call:
+--   select=...,user:profiles!user_id(display_name,avatar_url)
+-- PostgREST only embeds across a foreign key, and user_id currently references
+-- auth.users (not exposed via the API). profiles.id is the same uuid
+-- (see handle_new_user() in 20260221000000_create_profiles.sql).
+
+alter table public.exercise_submissions
+  add constraint exercise_submissions_user_id_profiles_fkey
+  foreign key (user_id) references public.profiles (id) on delete cascade;
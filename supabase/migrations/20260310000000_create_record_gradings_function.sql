@@ -0,0 +1,30 @@
+-- Migration: Create public.record_gradings() for the grading worker's batched writes
+-- Phase 3.5 — writes the results of many gradings in one round-trip
+-- Called by: app/workers/write_buffer.py via supabase.rpc()
+--
+-- p_rows is a JSON array of {"id", "status", "llm_score"?, "llm_feedback"?}.
+-- Only the columns the worker owns are written: llm_score, llm_feedback and
+-- status. Status guard (docs/AGENTS.md Section 4.5): only 'submitted' rows
+-- may move to 'ai_graded' or 'grading_failed', so a submission reviewed while
+-- it was being graded is left untouched.
+--
+-- Returns the ids of the rows that were actually updated.
+
+create or replace function public.record_gradings(p_rows jsonb)
+returns setof uuid
+language sql
+as $$
+  update public.exercise_submissions as s
+     set llm_score = coalesce(r.llm_score, s.llm_score),
+         llm_feedback = coalesce(r.llm_feedback, s.llm_feedback),
+         status = r.status
+    from jsonb_to_recordset(p_rows) as r(id uuid, status text, llm_score integer, llm_feedback jsonb)
+   where s.id = r.id
+     and s.status = 'submitted'
+     and r.status in ('ai_graded', 'grading_failed')
+  returning s.id;
+$$;
+
+-- Only the backend (Service Role Key) may call this.
+revoke execute on function public.record_gradings(jsonb) from public, anon, authenticated;
+grant execute on function public.record_gradings(jsonb) to service_role;
@@ -0,0 +1,16 @@
+-- Migration: Indexes for the admin submissions list's keyset pagination
+-- Phase 3 — GET /api/v1/admin/submissions (app/api/v1/admin.py)
+--
+-- The list orders by (submitted_at desc, id desc) and pages with
+--   submitted_at < :ts or (submitted_at = :ts and id < :id)
+-- optionally filtered by status. With these indexes Postgres walks the index
+-- from the cursor position and stops after page_size + 1 rows, instead of
+-- sorting the whole (filtered) table on every page.
+
+-- Unfiltered list
+create index if not exists idx_submissions_submitted_at_id
+  on public.exercise_submissions (submitted_at desc, id desc);
+
+-- List filtered by status (e.g. 'submitted' for the review queue)
+create index if not exists idx_submissions_status_submitted_at_id
+  on public.exercise_submissions (status, submitted_at desc, id desc);